@@ -23,11 +23,19 @@ from src.agents.nl_processor_simple import NLProcessor
 from src.agents.tdd_test_generation_agent import TDDTestGenerationAgent
 from src.automation.typescript_test_executor import TypeScriptTestExecutor
 from src.infrastructure.report_generator_simple import ReportGenerator
+from src.infrastructure.data_storage import aclose_all_storage
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+# Use uvloop's libuv-based event loop when available (not supported on Windows)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 # Setup logging
 setup_logging(level="INFO", output_dir="logs")
 
@@ -94,6 +102,11 @@ def initialize_services():
 # Initialize services on startup
 services_available = initialize_services()
 
+@app.on_event("shutdown")
+async def shutdown_storage():
+    """Flush batched storage writes and close shard files before the process exits"""
+    await aclose_all_storage()
+
 # Request/Response models
 class TestRequest(BaseModel):
     instructions: str
@@ -214,6 +227,7 @@ async def start_test(request: TestRequest):
 async def unified_test_execution(execution_id: str, request: TestRequest):
     """Unified test execution that prevents multiple AI agent calls"""
     execution = active_executions[execution_id]
+    prewarm_task = None
     
     try:
         logger.info(f"[{execution_id}] Starting unified test execution")
@@ -244,6 +258,11 @@ async def unified_test_execution(execution_id: str, request: TestRequest):
         # Step 2: Smart Test Code Generation - Skip TDD for login, use pre-built
         if "test_generation" not in execution["agents_completed"]:
             
+            # Generated tests are executed next, so overlap the shared browser/dependency
+            # setup with generation; the executor joins this run instead of starting another
+            if services_available and typescript_test_executor:
+                prewarm_task = typescript_test_executor.start_prewarm()
+            
             # Extract intent type from processed instructions
             intent_type = processed_instructions.get("intent_type", "unknown")
             logger.info(f"[{execution_id}] Detected intent type: {intent_type}")
@@ -353,7 +372,8 @@ async def unified_test_execution(execution_id: str, request: TestRequest):
                     user_credentials={
                         "username": request.username,
                         "password": request.password
-                    } if request.username and request.password else None
+                    } if request.username and request.password else None,
+                    prewarm_task=prewarm_task
                 )
                 logger.info(f"[{execution_id}] TypeScript test execution completed successfully")
             except Exception as e:
@@ -410,7 +430,7 @@ async def unified_test_execution(execution_id: str, request: TestRequest):
         })
     
     finally:
-        # Cleanup
+        # Cleanup (a still-running setup is shared with other requests, so it is left to finish)
         if execution_id in execution_locks:
             del execution_locks[execution_id]
 
@@ -633,4 +653,4 @@ async def get_workflow_template(template_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop" if uvloop else "asyncio")
\ No newline at end of file
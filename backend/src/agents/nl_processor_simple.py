@@ -17,6 +17,8 @@ class NLProcessor:
     
     def __init__(self, azure_client: AzureOpenAIClient):
         self.azure_client = azure_client
+        # System prompt is constant, build it once per agent instead of per request
+        self.system_prompt = PromptTemplates.nl_processor_prompt()
         
     def process_instructions(self, instructions: str, url: str) -> Dict[str, Any]:
         """
@@ -31,7 +33,7 @@ class NLProcessor:
         """
         try:
             # Use Azure OpenAI for processing
-            system_prompt = PromptTemplates.nl_processor_prompt()
+            system_prompt = self.system_prompt
             user_prompt = f"""
             URL: {url}
             Instructions: {instructions}
@@ -45,7 +47,7 @@ class NLProcessor:
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 response_format="json",
-                temperature=0.1
+                temperature=0.0  # Deterministic classification; temperature 0 calls are cached
             )
             
             if response.success:
@@ -19,6 +19,35 @@ from ..core.azure_client import AzureOpenAIClient, AIResponse
 
 logger = logging.getLogger(__name__)
 
+# System prompt for AI workflow detection, built once at import
+_WORKFLOW_DETECTION_PROMPT = """You are an expert at identifying Cisco Catalyst Centre workflow patterns from user instructions.
+
+Analyze the user input and determine if it represents a complex workflow that requires multiple steps beyond simple navigation/clicking.
+
+Available workflow types:
+- create_fabric: Setting up network fabric/SDA
+- create_device_group: Creating device groups  
+- network_hierarchy: Setting up site hierarchy
+- device_provisioning: Provisioning/deploying devices
+- configure_vlan: VLAN configuration
+
+Output JSON format:
+{
+    "workflow_detected": boolean,
+    "workflow_id": "workflow_type or null",
+    "confidence_score": 0.0-1.0,
+    "extracted_values": {
+        "field_name": "extracted_value"
+    },
+    "reasoning": "brief explanation"
+}
+
+Look for:
+- Complex multi-step processes
+- Cisco-specific terminology
+- Configuration/setup tasks
+- Infrastructure management operations"""
+
 class WorkflowIntelligenceAgent:
     """
     Intelligent workflow detection and template generation agent
@@ -205,38 +234,11 @@ class WorkflowIntelligenceAgent:
     async def _detect_workflow_ai(self, user_input: str, parsed_nl_result: Dict[str, Any]) -> WorkflowDetectionResult:
         """Use AI to detect workflow with context from NL processing"""
         
-        system_prompt = """You are an expert at identifying Cisco Catalyst Centre workflow patterns from user instructions.
-
-Analyze the user input and determine if it represents a complex workflow that requires multiple steps beyond simple navigation/clicking.
-
-Available workflow types:
-- create_fabric: Setting up network fabric/SDA
-- create_device_group: Creating device groups  
-- network_hierarchy: Setting up site hierarchy
-- device_provisioning: Provisioning/deploying devices
-- configure_vlan: VLAN configuration
-
-Output JSON format:
-{
-    "workflow_detected": boolean,
-    "workflow_id": "workflow_type or null",
-    "confidence_score": 0.0-1.0,
-    "extracted_values": {
-        "field_name": "extracted_value"
-    },
-    "reasoning": "brief explanation"
-}
-
-Look for:
-- Complex multi-step processes
-- Cisco-specific terminology
-- Configuration/setup tasks
-- Infrastructure management operations"""
-
+        # Compact JSON: indentation only adds prompt tokens
         user_prompt = f"""
 User Input: "{user_input}"
 
-NL Processing Result: {json.dumps(parsed_nl_result, indent=2)}
+NL Processing Result: {json.dumps(parsed_nl_result, separators=(",", ":"))}
 
 Analyze if this represents a complex Cisco Catalyst Centre workflow requiring template customization.
 """
@@ -244,7 +246,7 @@ Analyze if this represents a complex Cisco Catalyst Centre workflow requiring te
         try:
             response = await self.azure_client.call_agent(
                 agent_name="WorkflowDetection",
-                system_prompt=system_prompt,
+                system_prompt=_WORKFLOW_DETECTION_PROMPT,
                 user_prompt=user_prompt,
                 response_format="json",
                 temperature=0.1
@@ -7,7 +7,7 @@ Executes generated TypeScript Playwright test files using npx playwright test
 import os
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 class TypeScriptTestExecutor:
     """Executor for TypeScript Playwright test files"""
@@ -15,10 +15,26 @@ class TypeScriptTestExecutor:
     def __init__(self, e2e_path: str = None, timeout: int = 600):
         self.e2e_path = e2e_path or "/Users/varsaraf/Downloads/MVP/backend/e2e"
         self.timeout = timeout
+        # One setup run at a time in the shared e2e directory, joined by every concurrent request
+        self._setup_task: Optional[asyncio.Task] = None
         print(f"✅ [TypeScriptTestExecutor] Initialized with path: {self.e2e_path}")
     
+    def start_prewarm(self) -> asyncio.Task:
+        """Start dependency and browser setup in the background, or join the setup already running"""
+        if self._setup_task is None or self._setup_task.done():
+            self._setup_task = asyncio.create_task(self._setup_dependencies())
+            self._setup_task.add_done_callback(self._on_setup_done)
+        return self._setup_task
+    
+    @staticmethod
+    def _on_setup_done(task: asyncio.Task) -> None:
+        """Retrieve the outcome of a setup run nobody ended up awaiting"""
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️ [TypeScriptTestExecutor] Background setup failed: {task.exception()}")
+    
     async def execute_typescript_test(self, test_file_path: str, session_dir: str, application_url: str, 
-                          user_credentials: Dict[str, str] = None) -> Dict[str, Any]:
+                          user_credentials: Dict[str, str] = None,
+                          prewarm_task: Optional[asyncio.Task] = None) -> Dict[str, Any]:
         """Execute a TypeScript Playwright test file"""
         try:
             print(f"🚀 [TypeScriptTestExecutor] Starting test execution: {test_file_path}")
@@ -26,8 +42,11 @@ class TypeScriptTestExecutor:
             if not os.path.exists(test_file_path):
                 return {"success": False, "error": f"Test file not found: {test_file_path}"}
             
-            # Ensure dependencies are set up for automated execution
-            await self._setup_dependencies()
+            # Ensure dependencies are set up for automated execution; shielded so a
+            # cancelled request never interrupts an install other requests are waiting on
+            if prewarm_task is None:
+                prewarm_task = self.start_prewarm()
+            await asyncio.shield(prewarm_task)
             
             # Extract session ID from test filename for artifact management
             test_filename = os.path.basename(test_file_path)
@@ -170,6 +189,12 @@ class TypeScriptTestExecutor:
                 process.kill()
                 await process.wait()
                 raise Exception(f"Command timed out after {timeout or self.timeout} seconds")
+            except BaseException:
+                # Cancelled (or otherwise interrupted): never leave the child process running
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
             
             stdout_text = stdout.decode('utf-8') if stdout else ""
             stderr_text = stderr.decode('utf-8') if stderr else ""
@@ -9,20 +9,153 @@ import logging
 import asyncio
 import os
 import base64
+import copy
+import hashlib
+import time
+import random
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from openai import AzureOpenAI
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable, Final, TypedDict
+from openai import (
+    AsyncAzureOpenAI, AuthenticationError,
+    RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+)
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 # Load environment variables from config/.env file
 config_dir = Path(__file__).parent.parent.parent / "config"
 env_path = config_dir / ".env"
-load_dotenv(dotenv_path=env_path)
+# Skip parsing the file when the process environment already carries the credentials
+if not os.getenv("AZURE_OPENAI_CLIENT_ID"):
+    load_dotenv(dotenv_path=env_path, override=False)
 
 logger = logging.getLogger(__name__)
 
+# Shared decoder for raw_decode recovery paths
+_DECODER = json.JSONDecoder()
+
+# Transient failures worth backing off for; anything else (bad request, auth) fails fast
+_RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+# Shared keep-alive session so token refreshes reuse the TCP/TLS connection
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
+# Async SDK clients shared by instances holding the same token: key -> [client, holder count]
+_sdk_clients: Dict[Tuple[str, str, str], List[Any]] = {}
+_sdk_clients_lock = threading.Lock()
+
+
+def _acquire_sdk_client(endpoint: str, api_version: str, api_key: str) -> AsyncAzureOpenAI:
+    """Build (or reuse) the async SDK client so instances sharing a token share a connection pool"""
+    key = (endpoint, api_version, api_key)
+    with _sdk_clients_lock:
+        entry = _sdk_clients.get(key)
+        if entry is None:
+            entry = _sdk_clients[key] = [
+                AsyncAzureOpenAI(azure_endpoint=endpoint, api_key=api_key, api_version=api_version), 0
+            ]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_sdk_client(endpoint: str, api_version: str, api_key: str) -> Optional[AsyncAzureOpenAI]:
+    """Drop one holder of a shared SDK client, returning the client once nobody holds it"""
+    key = (endpoint, api_version, api_key)
+    with _sdk_clients_lock:
+        entry = _sdk_clients.get(key)
+        if entry is None:
+            return None
+        entry[1] -= 1
+        if entry[1] > 0:
+            return None
+        del _sdk_clients[key]
+        return entry[0]
+
+
+def _close_sdk_client(client: Optional[AsyncAzureOpenAI], loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close a replaced SDK client on the loop its pooled connections belong to"""
+    # A client never used on a loop has opened no connections, so there is nothing to release
+    if client is None or loop is None or loop.is_closed():
+        return
+    asyncio.run_coroutine_threadsafe(client.close(), loop)
+
+
+class CallSpec(TypedDict, total=False):
+    """Keyword arguments for one call_agent invocation in a call_agents batch"""
+    agent_name: str
+    system_prompt: str
+    user_prompt: str
+    response_format: str
+    temperature: float
+    max_retries: int
+    cache: bool
+    system_suffix: Optional[str]
+    stream: bool
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Text delta carried by a streamed completion chunk"""
+    if not chunk.choices:
+        return ""
+    return chunk.choices[0].delta.content or ""
+
+
+class _JsonStreamTracker:
+    """Tracks brace depth over streamed text to spot when the top-level JSON object closes"""
+    
+    def __init__(self):
+        self.parts: List[str] = []
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Add a chunk of text, returning True once the top-level object is complete"""
+        self.parts.append(text)
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '{':
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+    
+    @property
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+
 @dataclass
 class AIResponse:
     """Structured response from AI calls"""
@@ -39,53 +172,142 @@ class AzureOpenAIClient:
     - Automatic retry with exponential backoff
     - Structured JSON response parsing
     - Agent-specific prompt optimization
+    - Client-side response cache for deterministic calls
     """
     
+    # Event loop thread shared by all instances for call_agent_sync
+    _sync_loop: Optional[asyncio.AbstractEventLoop] = None
+    _sync_loop_lock = threading.Lock()
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         # Load credentials from environment variables or config
-        self.client_id = os.getenv('AZURE_OPENAI_CLIENT_ID') or (config and config.get('client_id'))
-        self.client_secret = os.getenv('AZURE_OPENAI_CLIENT_SECRET') or (config and config.get('client_secret'))
-        self.app_key = os.getenv('APP_KEY') or (config and config.get('app_key'))
-        self.deployment_name = os.getenv('AZURE_DEPLOYMENT_NAME', 'gpt-4.1') or (config and config.get('deployment_name', 'gpt-4.1'))
-        self.api_version = os.getenv('AZURE_API_VERSION', '2024-07-01-preview') or (config and config.get('api_version', '2024-07-01-preview'))
-        self.api_base = os.getenv('AZURE_ENDPOINT', 'some_endpoint') or (config and config.get('api_base', 'some_endpoint'))
-        self.cisco_idp = os.getenv('AZURE_CISCO_IDP', 'some_idp')
+        env = os.environ
+        self.client_id = env.get('AZURE_OPENAI_CLIENT_ID') or (config and config.get('client_id'))
+        self.client_secret = env.get('AZURE_OPENAI_CLIENT_SECRET') or (config and config.get('client_secret'))
+        self.app_key = env.get('APP_KEY') or (config and config.get('app_key'))
+        self.deployment_name = env.get('AZURE_DEPLOYMENT_NAME', 'gpt-4.1') or (config and config.get('deployment_name', 'gpt-4.1'))
+        self.api_version = env.get('AZURE_API_VERSION', '2024-07-01-preview') or (config and config.get('api_version', '2024-07-01-preview'))
+        self.api_base = env.get('AZURE_ENDPOINT', 'some_endpoint') or (config and config.get('api_base', 'some_endpoint'))
+        self.cisco_idp = env.get('AZURE_CISCO_IDP', 'some_idp')
+        
+        client_config = config or {}
+        
+        # Response cache settings (LRU with TTL)
+        self.cache_ttl_seconds = client_config.get('cache_ttl_seconds', 3600)
+        self.cache_max_entries = client_config.get('cache_max_entries', 256)
+        self._response_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # call_agent_sync runs on its own loop thread, so cache reads and evictions are locked
+        self._response_cache_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
+        
+        # Upper bound on in-flight requests for call_agents batches
+        self.max_concurrent_calls = client_config.get('max_concurrent_calls', 8)
+        
+        # Prompt size budget, checked once per prompt before truncating
+        self._max_prompt_chars = client_config.get('max_prompt_chars', 1000000)
+        self._max_prompt_tokens = client_config.get('max_prompt_tokens', 250000)
+        self._encoding = self._load_encoding()
         
         # Validate required credentials
         if not all([self.client_id, self.client_secret, self.app_key]):
             raise ValueError("Missing required Azure credentials. Check environment variables or config.")
         
-        # Get access token from Cisco IDP
-        self.access_token = self._get_access_token()
+        # The appkey user field and IDP auth header are constant per process, build them once
+        self._user_field = json.dumps({"appkey": self.app_key})
+        credentials = f"{self.client_id}:{self.client_secret}".encode("utf-8")
+        self._basic_auth_header = f"Basic {base64.b64encode(credentials).decode('utf-8')}"
         
-        # Initialize Azure OpenAI client
-        self.client = AzureOpenAI(
-            azure_endpoint=self.api_base,
-            api_key=self.access_token,
-            api_version=self.api_version
-        )
+        # Get access token from Cisco IDP and build the clients around it
+        self._access_token: Optional[str] = None
+        self._token_expiry = 0.0
+        self.aclient: Optional[AsyncAzureOpenAI] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Built lazily on the call_agent_sync loop, whose connection pool it owns
+        self._background_aclient: Optional[AsyncAzureOpenAI] = None
+        self._refresh_token()
+        
+        # One refresh lock per event loop (caller's loop and the call_agent_sync loop),
+        # since asyncio locks are bound to the loop they are first used on
+        self._token_locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
         
         logger.info(f"Azure OpenAI client initialized with deployment: {self.deployment_name}")
     
+    def _token_expired(self) -> bool:
+        """Whether the access token is missing or past its refresh point"""
+        return self._access_token is None or time.monotonic() >= self._token_expiry
+    
+    def _get_token_lock(self) -> asyncio.Lock:
+        """Return the token refresh lock for the running event loop"""
+        loop = asyncio.get_running_loop()
+        lock = self._token_locks.get(loop)
+        if lock is None:
+            for stale_loop in [l for l in list(self._token_locks) if l.is_closed()]:
+                self._token_locks.pop(stale_loop, None)
+            lock = self._token_locks[loop] = asyncio.Lock()
+        return lock
+    
+    async def _ensure_token_async(self, rejected_token: Optional[str] = None) -> None:
+        """
+        Refresh the access token without blocking the event loop
+        
+        Concurrent callers share one refresh: the IDP request runs in a worker thread
+        behind a lock, and callers that waited on it re-check before refreshing again.
+        
+        Args:
+            rejected_token: Token the service refused; refresh unless it was already replaced
+        """
+        def needs_refresh() -> bool:
+            if rejected_token is not None:
+                return self._access_token == rejected_token
+            return self._token_expired()
+        
+        if not needs_refresh():
+            return
+        async with self._get_token_lock():
+            if needs_refresh():
+                await asyncio.to_thread(self._refresh_token)
+    
+    def _refresh_token(self) -> None:
+        """Fetch a new access token and rebuild the Azure OpenAI clients with it"""
+        old_token = self._access_token
+        old_aclient_loop = self._aclient_loop
+        old_background_aclient = self._background_aclient
+        self._access_token = self._get_access_token()
+        
+        # Async client for the caller's loop; call_agent_sync builds its own
+        # on the background loop, since async connection pools are tied to one loop
+        self.aclient = _acquire_sdk_client(self.api_base, self.api_version, self._access_token)
+        self._aclient_loop = None
+        self._background_aclient = None
+        
+        # Clients built for the old token are dead weight once nobody else holds them
+        if old_token is not None:
+            _close_sdk_client(_release_sdk_client(self.api_base, self.api_version, old_token), old_aclient_loop)
+        _close_sdk_client(old_background_aclient, type(self)._sync_loop)
+    
     def _get_access_token(self) -> str:
-        """Get access token from Cisco IDP"""
+        """Get access token from Cisco IDP and record when it expires"""
         try:
             payload = "grant_type=client_credentials"
-            value = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode("utf-8")).decode("utf-8")
             headers = {
                 "Accept": "*/*",
                 "Content-Type": "application/x-www-form-urlencoded",
-                "Authorization": f"Basic {value}"
+                "Authorization": self._basic_auth_header
             }
 
-            token_response = requests.post(self.cisco_idp, headers=headers, data=payload)
+            token_response = _http_session.post(self.cisco_idp, headers=headers, data=payload, timeout=10)
             if token_response.status_code != 200:
                 raise Exception(f"Failed to fetch token: {token_response.text}")
 
-            access_token = token_response.json().get("access_token")
+            token_data = token_response.json()
+            access_token = token_data.get("access_token")
             if not access_token:
                 raise Exception("No access token returned from Cisco IDP.")
             
+            # Refresh a minute early so in-flight calls don't race the expiry
+            expires_in = token_data.get("expires_in", 3600)
+            self._token_expiry = time.monotonic() + max(int(expires_in) - 60, 0)
+            
             logger.info("Successfully obtained access token from Cisco IDP")
             return access_token
             
@@ -99,49 +321,139 @@ class AzureOpenAIClient:
                         user_prompt: str,
                         response_format: str = "json",
                         temperature: float = 0.1,
-                        max_retries: int = 3) -> AIResponse:
+                        max_retries: int = 3,
+                        cache: bool = False,
+                        system_suffix: Optional[str] = None,
+                        stream: bool = False) -> AIResponse:
         """
         Main method for agent AI calls with error handling and retries
         
         Args:
             agent_name: Name of calling agent (for logging)
-            system_prompt: System instruction
+            system_prompt: System instruction, kept static so the provider can cache the prefix
             user_prompt: User query
             response_format: "json" or "text"
             temperature: Randomness (0.0-1.0)
             max_retries: Number of retry attempts
+            cache: Reuse responses for identical prompts (always on when temperature is 0)
+            system_suffix: Per-call system instructions, sent after the static system prompt
+            stream: Stream JSON responses and stop reading once the top-level object closes
         """
+        return await self._call_agent(
+            agent_name, system_prompt, user_prompt, response_format, temperature,
+            max_retries, cache, system_suffix, self._create_completion_async, stream=stream
+        )
+    
+    async def call_agents(self, specs: List["CallSpec"]) -> List[AIResponse]:
+        """
+        Run independent agent calls concurrently, returning responses in spec order
+        
+        Args:
+            specs: call_agent keyword arguments, one dict per call
+        """
+        # Created per batch so it binds to the running event loop
+        semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+        
+        async def run(spec: "CallSpec") -> AIResponse:
+            async with semaphore:
+                return await self.call_agent(**spec)
+        
+        return list(await asyncio.gather(*(run(spec) for spec in specs)))
+    
+    async def _call_agent(self,
+                          agent_name: str,
+                          system_prompt: str,
+                          user_prompt: str,
+                          response_format: str,
+                          temperature: float,
+                          max_retries: int,
+                          cache: bool,
+                          system_suffix: Optional[str],
+                          create_completion: Callable[..., Awaitable[Any]],
+                          stream: bool = False) -> AIResponse:
+        """Serve the call from the response cache or make it with the given completion function"""
+        
+        use_cache = cache or temperature <= 0.0
+        if use_cache:
+            cache_key = self._cache_key(system_prompt, user_prompt, response_format, temperature, system_suffix)
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                logger.info(f"[{agent_name}] Returning cached AI response")
+                return cached_response
+        
+        response = await self._call_agent_uncached(
+            agent_name, system_prompt, user_prompt, response_format, temperature,
+            max_retries, system_suffix, create_completion, stream=stream
+        )
+        
+        if use_cache and response.success:
+            self._store_cached_response(cache_key, response)
+        
+        return response
+    
+    async def _call_agent_uncached(self,
+                                   agent_name: str,
+                                   system_prompt: str,
+                                   user_prompt: str,
+                                   response_format: str,
+                                   temperature: float,
+                                   max_retries: int,
+                                   system_suffix: Optional[str],
+                                   create_completion: Callable[..., Awaitable[Any]],
+                                   stream: bool = False) -> AIResponse:
+        """Make the AI call with retries, bypassing the response cache"""
         
         # Optimize prompts to stay within token limits
         optimized_system = self._optimize_prompt(system_prompt)
         optimized_user = self._optimize_prompt(user_prompt)
         
+        # Static system prompt first so the provider's prefix cache can match it byte-for-byte,
+        # dynamic content strictly after it
+        messages = [{"role": "system", "content": optimized_system}]
+        if system_suffix:
+            messages.append({"role": "system", "content": self._optimize_prompt(system_suffix)})
+        messages.append({"role": "user", "content": optimized_user})
+        
+        token_refreshed = False
+        request_token = self._access_token
         for attempt in range(max_retries + 1):
             try:
                 logger.info(f"[{agent_name}] Making AI call (attempt {attempt + 1})")
                 
-                response = self.client.chat.completions.create(
-                    model=self.deployment_name,
-                    messages=[
-                        {"role": "system", "content": optimized_system},
-                        {"role": "user", "content": optimized_user}
-                    ],
-                    temperature=temperature,
-                    user=json.dumps({"appkey": self.app_key})
-                )
+                # Refresh an expired token before the call, off the event loop
+                await self._ensure_token_async()
+                request_token = self._access_token
                 
-                # Extract response content
-                content = response.choices[0].message.content
-                tokens_used = response.usage.total_tokens if response.usage else 0
+                if stream and response_format == "json":
+                    content = await self._read_json_stream(await create_completion(
+                        model=self.deployment_name,
+                        messages=messages,
+                        temperature=temperature,
+                        user=self._user_field,
+                        stream=True
+                    ))
+                    tokens_used = 0  # Usage is not reported on streamed responses
+                else:
+                    response = await create_completion(
+                        model=self.deployment_name,
+                        messages=messages,
+                        temperature=temperature,
+                        user=self._user_field
+                    )
+                    
+                    # Extract response content
+                    content = response.choices[0].message.content
+                    tokens_used = response.usage.total_tokens if response.usage else 0
                 
                 logger.info(f"[{agent_name}] AI call successful, tokens used: {tokens_used}")
-                logger.info(f"[{agent_name}] Raw Azure OpenAI Response: {content}")
+                # Full payloads are multi-KB, log them lazily and only at DEBUG
+                logger.debug("[%s] Raw Azure OpenAI Response: %s", agent_name, content)
                 
                 # Parse response based on format
                 if response_format == "json":
                     try:
                         parsed_content = self._parse_json_response(content)
-                        logger.info(f"[{agent_name}] Parsed JSON Response: {parsed_content}")
+                        logger.debug("[%s] Parsed JSON Response: %s", agent_name, parsed_content)
                         return AIResponse(
                             content=parsed_content,
                             model=self.deployment_name,
@@ -167,10 +479,20 @@ class AzureOpenAIClient:
             except Exception as e:
                 logger.error(f"[{agent_name}] AI call failed (attempt {attempt + 1}): {e}")
                 
-                if attempt < max_retries:
-                    # Exponential backoff
-                    wait_time = 2 ** attempt
-                    logger.info(f"[{agent_name}] Retrying in {wait_time} seconds...")
+                if isinstance(e, AuthenticationError) and not token_refreshed and attempt < max_retries:
+                    # Token revoked or expired early: refresh once and retry immediately
+                    logger.info(f"[{agent_name}] Authentication failed, refreshing access token")
+                    token_refreshed = True
+                    try:
+                        await self._ensure_token_async(rejected_token=request_token)
+                        continue
+                    except Exception as refresh_error:
+                        logger.error(f"[{agent_name}] Token refresh failed: {refresh_error}")
+                
+                if attempt < max_retries and isinstance(e, _RETRYABLE_ERRORS):
+                    # Exponential backoff with jitter so concurrent agents don't retry in lockstep
+                    wait_time = min(30, 0.25 * (2 ** attempt)) * (0.5 + random.random())
+                    logger.info(f"[{agent_name}] Retrying in {wait_time:.2f} seconds...")
                     await asyncio.sleep(wait_time)
                 else:
                     return AIResponse(
@@ -186,82 +508,184 @@ class AzureOpenAIClient:
                        user_prompt: str,
                        response_format: str = "json",
                        temperature: float = 0.1,
-                       max_retries: int = 3) -> AIResponse:
+                       max_retries: int = 3,
+                       cache: bool = False,
+                       system_suffix: Optional[str] = None,
+                       stream: bool = False) -> AIResponse:
         """
         Synchronous wrapper for call_agent method
+        Runs on a shared background event loop so its async client keeps
+        connections alive between calls, instead of a fresh asyncio.run loop per call
         """
-        return asyncio.run(self.call_agent(
-            agent_name=agent_name,
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            response_format=response_format,
-            temperature=temperature,
-            max_retries=max_retries
-        ))
+        return asyncio.run_coroutine_threadsafe(self._call_agent(
+            agent_name, system_prompt, user_prompt, response_format, temperature,
+            max_retries, cache, system_suffix, self._create_completion_background, stream=stream
+        ), self._get_sync_loop()).result()
+    
+    @classmethod
+    def _get_sync_loop(cls) -> asyncio.AbstractEventLoop:
+        """Start (once) and return the background event loop serving call_agent_sync"""
+        with cls._sync_loop_lock:
+            if cls._sync_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="azure-openai-sync-loop", daemon=True).start()
+                cls._sync_loop = loop
+            return cls._sync_loop
+    
+    async def _read_json_stream(self, stream_response: Any) -> str:
+        """Accumulate streamed content until the top-level JSON object is complete"""
+        tracker = _JsonStreamTracker()
+        try:
+            if hasattr(stream_response, "__aiter__"):
+                async for chunk in stream_response:
+                    if tracker.feed(_chunk_text(chunk)):
+                        break
+            else:
+                for chunk in stream_response:
+                    if tracker.feed(_chunk_text(chunk)):
+                        break
+        finally:
+            # Stop the server from sending trailing tokens we won't read
+            close_result = stream_response.close()
+            if asyncio.iscoroutine(close_result):
+                await close_result
+        return tracker.text
+    
+    async def _create_completion_async(self, **request: Any) -> Any:
+        """Create a chat completion without blocking the event loop"""
+        # Remember the loop holding the client's connections so a token refresh can close them there
+        self._aclient_loop = asyncio.get_running_loop()
+        return await self.aclient.chat.completions.create(**request)
+    
+    async def _create_completion_background(self, **request: Any) -> Any:
+        """Create a chat completion on the background loop with a client bound to that loop"""
+        if self._background_aclient is None:
+            self._background_aclient = AsyncAzureOpenAI(
+                azure_endpoint=self.api_base,
+                api_key=self._access_token,
+                api_version=self.api_version
+            )
+        return await self._background_aclient.chat.completions.create(**request)
+    
+    def _cache_key(self, system_prompt: str, user_prompt: str, response_format: str,
+                   temperature: float, system_suffix: Optional[str] = None) -> str:
+        """Build a stable cache key for an AI call"""
+        key_data = json.dumps({
+            "deployment": self.deployment_name,
+            "system": _STATIC_PROMPT_DIGESTS.get(system_prompt, system_prompt),
+            "system_suffix": system_suffix,
+            "user": user_prompt,
+            "temperature": temperature,
+            "response_format": response_format
+        }, sort_keys=True)
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[AIResponse]:
+        """Return a copy of a cached response if present and not expired"""
+        with self._response_cache_lock:
+            entry = self._response_cache.get(cache_key)
+            if entry is not None:
+                expires_at, content = entry
+                if time.monotonic() < expires_at:
+                    self._response_cache.move_to_end(cache_key)
+                    self.cache_stats["hits"] += 1
+                else:
+                    del self._response_cache[cache_key]
+                    entry = None
+            if entry is None:
+                self.cache_stats["misses"] += 1
+                return None
+        
+        # Cached content is never mutated in place, so it can be copied outside the lock
+        return AIResponse(
+            content=copy.deepcopy(content),
+            model=self.deployment_name,
+            success=True
+        )
+    
+    def _store_cached_response(self, cache_key: str, response: AIResponse) -> None:
+        """Store the parsed content of a successful response, evicting the oldest entries"""
+        entry = (time.monotonic() + self.cache_ttl_seconds, copy.deepcopy(response.content))
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = entry
+            self._response_cache.move_to_end(cache_key)
+            while len(self._response_cache) > self.cache_max_entries:
+                self._response_cache.popitem(last=False)
+    
+    def clear_response_cache(self) -> None:
+        """Drop all cached AI responses"""
+        with self._response_cache_lock:
+            self._response_cache.clear()
+    
+    def _load_encoding(self):
+        """Load the tiktoken encoding for the deployment, or None to fall back to character budgets"""
+        if tiktoken is None:
+            return None
+        try:
+            try:
+                return tiktoken.encoding_for_model(self.deployment_name)
+            except KeyError:
+                return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"Token encoding unavailable, using character budget: {e}")
+            return None
     
     def _optimize_prompt(self, prompt: str) -> str:
         """Optimize prompt length to stay within token limits"""
-        if len(prompt) <= 0:
-            return prompt
+        if self._encoding is not None:
+            # Byte-level BPE tokens cover at least one UTF-8 byte each (not one character:
+            # non-ASCII text can take several tokens per character), so prompts whose byte
+            # length fits the budget skip encoding
+            if len(prompt) * 4 <= self._max_prompt_tokens or len(prompt.encode("utf-8")) <= self._max_prompt_tokens:
+                return prompt
+            tokens = self._encoding.encode(prompt, disallowed_special=())
+            if len(tokens) <= self._max_prompt_tokens:
+                return prompt
+            return self._encoding.decode(tokens[:self._max_prompt_tokens - 16]) + "\n... [content truncated for token limit]"
         
-        # Truncate while preserving structure
-        lines = prompt.split('\n')
-        optimized_lines = []
-        current_length = 0
-        
-        for line in lines:
-            if current_length + len(line) <= 1000000:
-                optimized_lines.append(line)
-                current_length += len(line)
-            else:
-                # Add truncation indicator
-                optimized_lines.append("... [content truncated for token limit]")
-                break
+        if len(prompt) <= self._max_prompt_chars:
+            return prompt
         
-        return '\n'.join(optimized_lines)
+        # Truncate at the last line break inside the budget to preserve structure
+        cut = prompt.rfind('\n', 0, self._max_prompt_chars)
+        if cut == -1:
+            cut = self._max_prompt_chars
+        return prompt[:cut] + "\n... [content truncated for token limit]"
     
     def _parse_json_response(self, content: str) -> Dict[str, Any]:
         """Parse JSON response with error handling"""
-        # Remove common formatting issues
+        # Remove common formatting issues and markdown code fences if present;
+        # plain JSON replies (no backticks) skip the fence handling entirely
         cleaned_content = content.strip()
-        
-        # Remove markdown code blocks if present
-        if cleaned_content.startswith('```json'):
-            cleaned_content = cleaned_content[7:]
-        if cleaned_content.endswith('```'):
-            cleaned_content = cleaned_content[:-3]
-        
-        cleaned_content = cleaned_content.strip()
+        if '`' in cleaned_content:
+            cleaned_content = cleaned_content.strip('`').removeprefix('json').strip()
         
         try:
-            return json.loads(cleaned_content)
-        except json.JSONDecodeError as e:
-            # Handle "Extra data" error by finding the first complete JSON object
-            if "Extra data" in str(e):
-                try:
-                    # Parse only up to the first complete JSON object
-                    decoder = json.JSONDecoder()
-                    result, idx = decoder.raw_decode(cleaned_content)
-                    logger.warning(f"Found extra data after JSON: {cleaned_content[idx:]}")
-                    return result
-                except:
-                    pass
+            return _json_loads(cleaned_content)
+        except json.JSONDecodeError:
+            # Handle extra data after the payload by finding the first complete JSON object.
+            # orjson words this error differently from stdlib "Extra data", so always try it;
+            # raw_decode only succeeds when the content starts with a complete object.
+            try:
+                result, idx = _DECODER.raw_decode(cleaned_content)
+                logger.warning(f"Found extra data after JSON: {cleaned_content[idx:]}")
+                return result
+            except json.JSONDecodeError:
+                pass
             # If that fails, try to extract JSON from the content
             return self._extract_json_from_text(cleaned_content)
     
     def _extract_json_from_text(self, content: str) -> Dict[str, Any]:
         """Extract JSON from mixed text content"""
-        import re
         
-        # Try to find JSON object in text
-        json_pattern = r'\{.*\}'
-        matches = re.findall(json_pattern, content, re.DOTALL)
-        
-        for match in matches:
+        # Try to decode a JSON object starting at each opening brace, first success wins
+        idx = content.find('{')
+        while idx != -1:
             try:
-                return json.loads(match)
+                result, _ = _DECODER.raw_decode(content, idx)
+                return result
             except json.JSONDecodeError:
-                continue
+                idx = content.find('{', idx + 1)
         
         # Fallback: return error structure
         return {
@@ -269,13 +693,8 @@ class AzureOpenAIClient:
             "raw_content": content[:500]  # First 500 chars for debugging
         }
 
-# Agent-specific prompt templates
-class PromptTemplates:
-    """Optimized prompt templates for different agents"""
-    
-    @staticmethod
-    def nl_processor_prompt() -> str:
-        return """You are an expert at understanding E2E testing requirements for Cisco Catalyst Centre applications.
+# Agent-specific prompt templates, built once at import
+_NL_PROCESSOR_PROMPT: Final[str] = """You are an expert at understanding E2E testing requirements for Cisco Catalyst Centre applications.
 Parse user input into structured test intent optimized for fabric management and authentication workflows.
 
 CRITICAL INTENT CLASSIFICATION RULES:
@@ -316,10 +735,8 @@ EXAMPLES:
 - "login with username and password" → login
 
 Be specific and actionable. Focus on what can actually be automated."""
-    
-    @staticmethod
-    def test_strategy_prompt() -> str:
-        return """Create comprehensive test strategy for legacy Java web applications.
+
+_TEST_STRATEGY_PROMPT: Final[str] = """Create comprehensive test strategy for legacy Java web applications.
 Consider enterprise application patterns like Cisco Catalyst Centre.
 
 Analyze:
@@ -363,10 +780,8 @@ Output JSON format:
 }
 
 Optimize for reliability over speed. Legacy apps need patience."""
-    
-    @staticmethod
-    def test_generation_prompt() -> str:
-        return """Generate Playwright test script optimized for legacy Java web applications.
+
+_TEST_GENERATION_PROMPT: Final[str] = """Generate Playwright test script optimized for legacy Java web applications.
 
 Key considerations:
 - EXTENDED timeouts (180s minimum for actions, 300s for navigation) - NEVER USE SHORT TIMEOUTS
@@ -447,6 +862,29 @@ IMPORTANT:
 - Make tests robust and debuggable. Include detailed selectors.
 - For login scenarios, include post-login verification steps"""
 
+# Digests of the static prompts so cache keys don't re-serialize multi-KB strings
+_STATIC_PROMPT_DIGESTS: Final[Dict[str, str]] = {
+    prompt: hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    for prompt in (_NL_PROCESSOR_PROMPT, _TEST_STRATEGY_PROMPT, _TEST_GENERATION_PROMPT)
+}
+
+
+class PromptTemplates:
+    """Optimized prompt templates for different agents"""
+    
+    @staticmethod
+    def nl_processor_prompt() -> str:
+        return _NL_PROCESSOR_PROMPT
+    
+    @staticmethod
+    def test_strategy_prompt() -> str:
+        return _TEST_STRATEGY_PROMPT
+    
+    @staticmethod
+    def test_generation_prompt() -> str:
+        return _TEST_GENERATION_PROMPT
+
+
 # Usage example and testing
 async def test_azure_client():
     """Test the Azure OpenAI client functionality"""
@@ -5,15 +5,47 @@ Handles loading, validation, and environment variable substitution
 """
 
 import os
+import re
+import copy
+import queue
+import atexit
+import hashlib
 import logging
+import logging.handlers
 import yaml
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+# libyaml-backed loader/dumper when available, pure-Python fallback otherwise
+try:
+    from yaml import CSafeLoader as _YamlLoader
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+    from yaml import SafeDumper as _YamlDumper
+
 logger = logging.getLogger(__name__)
 
+# Parsed and validated configs keyed by a digest of the substituted content
+_CONFIG_CACHE_MAX_ENTRIES = 32
+_config_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_config_cache_stats = {"hits": 0, "misses": 0}
+
+# Validation schema, built once at import and shared by every validate_config call
+_REQUIRED_SECTIONS = ('azure_openai', 'browser_config', 'agents')
+_REQUIRED_AZURE_FIELDS = ('endpoint', 'api_key', 'deployment_name', 'api_version')
+_VALID_BROWSER_TYPES = ('chromium', 'firefox', 'webkit')
+_EXPECTED_AGENTS = ('nl_processor', 'test_strategy', 'test_generation')
+
+# Background listener that owns the console/file handlers set up by setup_logging
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+# Pattern to match ${VAR_NAME} or ${VAR_NAME:default}
+_ENV_VAR_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
 @dataclass
 class ConfigValidationResult:
     """Result of configuration validation"""
@@ -45,7 +77,7 @@ def load_config(config_path: str = "config/app_config.yaml") -> Dict[str, Any]:
     env_file = config_file.parent / ".env"
     if env_file.exists():
         load_dotenv(env_file)
-        logger.info(f"Loaded environment variables from {env_file}")
+        logger.info("Loaded environment variables from %s", env_file)
     
     # Load YAML configuration
     try:
@@ -55,21 +87,10 @@ def load_config(config_path: str = "config/app_config.yaml") -> Dict[str, Any]:
         # Substitute environment variables
         config_content = substitute_env_variables(config_content)
         
-        # Parse YAML
-        config = yaml.safe_load(config_content)
-        
-        logger.info(f"Configuration loaded from {config_path}")
-        
-        # Validate configuration
-        validation_result = validate_config(config)
+        # Parse and validate YAML (cached by content)
+        config = _parse_and_validate(config_content)
         
-        if not validation_result.valid:
-            error_msg = f"Configuration validation failed: {', '.join(validation_result.errors)}"
-            raise ValueError(error_msg)
-        
-        if validation_result.warnings:
-            for warning in validation_result.warnings:
-                logger.warning(f"Configuration warning: {warning}")
+        logger.info("Configuration loaded from %s", config_path)
         
         return config
         
@@ -78,37 +99,74 @@ def load_config(config_path: str = "config/app_config.yaml") -> Dict[str, Any]:
     except Exception as e:
         raise ValueError(f"Failed to load configuration: {e}")
 
+def _parse_and_validate(config_content: str) -> Dict[str, Any]:
+    """
+    Parse and validate substituted YAML content
+    Identical content is served from an LRU cache; callers get their own copy
+    """
+    
+    content_hash = hashlib.blake2b(config_content.encode("utf-8")).digest()
+    
+    cached_config = _config_cache.get(content_hash)
+    if cached_config is not None:
+        _config_cache.move_to_end(content_hash)
+        _config_cache_stats["hits"] += 1
+        logger.debug("Config cache hit (hits=%s, misses=%s)", _config_cache_stats['hits'], _config_cache_stats['misses'])
+        return copy.deepcopy(cached_config)
+    
+    _config_cache_stats["misses"] += 1
+    
+    # Parse YAML
+    config = yaml.load(config_content, Loader=_YamlLoader)
+    
+    # Validate configuration
+    validation_result = validate_config(config)
+    
+    if not validation_result.valid:
+        error_msg = f"Configuration validation failed: {', '.join(validation_result.errors)}"
+        raise ValueError(error_msg)
+    
+    if validation_result.warnings:
+        for warning in validation_result.warnings:
+            logger.warning("Configuration warning: %s", warning)
+    
+    # Only successfully validated configs are cached
+    _config_cache[content_hash] = config
+    if len(_config_cache) > _CONFIG_CACHE_MAX_ENTRIES:
+        _config_cache.popitem(last=False)
+    
+    return copy.deepcopy(config)
+
 def substitute_env_variables(content: str) -> str:
     """
     Substitute environment variables in configuration content
     Supports ${VAR_NAME} and ${VAR_NAME:default_value} syntax
     """
     
-    import re
-    
-    def replace_var(match):
-        var_expr = match.group(1)
-        
-        if ':' in var_expr:
-            # Variable with default value
-            var_name, default_value = var_expr.split(':', 1)
-            return os.getenv(var_name.strip(), default_value.strip())
-        else:
-            # Variable without default
-            var_name = var_expr.strip()
-            value = os.getenv(var_name)
-            if value is None:
-                raise ValueError(f"Environment variable '{var_name}' is required but not set")
-            return value
-    
-    # Pattern to match ${VAR_NAME} or ${VAR_NAME:default}
-    pattern = r'\$\{([^}]+)\}'
+    # Nothing to substitute, skip the regex pass
+    if '${' not in content:
+        return content
     
     try:
-        return re.sub(pattern, replace_var, content)
+        return _ENV_VAR_PATTERN.sub(_replace_env_var, content)
     except Exception as e:
         raise ValueError(f"Environment variable substitution failed: {e}")
 
+def _replace_env_var(match: "re.Match") -> str:
+    """Resolve a single ${VAR_NAME} or ${VAR_NAME:default} placeholder"""
+    var_name, has_default, default_value = match.group(1).partition(':')
+    
+    if has_default:
+        # Variable with default value
+        return os.environ.get(var_name.strip(), default_value.strip())
+    
+    # Variable without default
+    var_name = var_name.strip()
+    value = os.environ.get(var_name)
+    if value is None:
+        raise ValueError(f"Environment variable '{var_name}' is required but not set")
+    return value
+
 def validate_config(config: Dict[str, Any]) -> ConfigValidationResult:
     """
     Validate configuration structure and required fields
@@ -124,52 +182,42 @@ def validate_config(config: Dict[str, Any]) -> ConfigValidationResult:
     warnings = []
     
     # Check required top-level sections
-    required_sections = ['azure_openai', 'browser_config', 'agents']
-    for section in required_sections:
+    for section in _REQUIRED_SECTIONS:
         if section not in config:
             errors.append(f"Missing required section: {section}")
     
     # Validate Azure OpenAI configuration
-    if 'azure_openai' in config:
-        azure_config = config['azure_openai']
-        
-        required_azure_fields = ['endpoint', 'api_key', 'deployment_name', 'api_version']
-        for field in required_azure_fields:
-            if field not in azure_config or not azure_config[field]:
+    azure_config = config.get('azure_openai')
+    if azure_config is not None:
+        for field in _REQUIRED_AZURE_FIELDS:
+            if not azure_config.get(field):
                 errors.append(f"Missing or empty Azure OpenAI field: {field}")
         
         # Validate endpoint format
-        if 'endpoint' in azure_config:
-            endpoint = azure_config['endpoint']
+        endpoint = azure_config.get('endpoint')
+        if endpoint is not None:
             if not endpoint.startswith('https://') or not endpoint.endswith('.openai.azure.com/'):
                 warnings.append("Azure OpenAI endpoint format may be incorrect")
         
         # Validate deployment name
-        if 'deployment_name' in azure_config:
-            deployment = azure_config['deployment_name']
+        deployment = azure_config.get('deployment_name')
+        if deployment is not None:
             if not deployment or deployment == "your-deployment-name":
                 errors.append("Azure OpenAI deployment_name must be configured")
     
     # Validate browser configuration
-    if 'browser_config' in config:
-        browser_config = config['browser_config']
-        
-        valid_browser_types = ['chromium', 'firefox', 'webkit']
-        if 'type' in browser_config:
-            if browser_config['type'] not in valid_browser_types:
-                errors.append(f"Invalid browser type. Must be one of: {valid_browser_types}")
+    browser_config = config.get('browser_config')
+    if browser_config is not None:
+        browser_type = browser_config.get('type')
+        if browser_type is not None and browser_type not in _VALID_BROWSER_TYPES:
+            errors.append(f"Invalid browser type. Must be one of: {list(_VALID_BROWSER_TYPES)}")
     
     # Validate agents configuration
-    if 'agents' in config:
-        agents_config = config['agents']
-        
-        expected_agents = ['nl_processor', 'test_strategy', 'test_generation']
-        for agent in expected_agents:
+    agents_config = config.get('agents')
+    if agents_config is not None:
+        for agent in _EXPECTED_AGENTS:
             if agent not in agents_config:
                 warnings.append(f"Missing agent configuration: {agent}")
-            else:
-                agent_config = agents_config[agent]
-    
     
     return ConfigValidationResult(
         valid=len(errors) == 0,
@@ -214,83 +262,110 @@ def setup_logging(level: str = "INFO", output_dir: str = "./logs"):
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
-    # Add our handlers
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    # Log calls only enqueue records; a background thread does the console/file writes
+    global _log_listener
+    if _log_listener is None:
+        atexit.register(_stop_log_listener)
+    _stop_log_listener()
     
-    logger.info(f"Logging configured - Level: {level}, Output: {log_file}")
-
-def get_default_config() -> Dict[str, Any]:
-    """
-    Get default configuration structure
-    Useful for initialization and testing
-    """
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
     
-    return {
-        "azure_openai": {
-            "endpoint": "${AZURE_OPENAI_ENDPOINT}",
-            "api_key": "${AZURE_OPENAI_API_KEY}",
-            "deployment_name": "gpt-4.1",
-            "api_version": "2024-10-21"
-        },
-        "application": {
-            "name": "Legacy Java Application",
-            "type": "legacy_java",
-            "default_timeout": 30000,
-            "slow_mo": 1000
+    logger.info("Logging configured - Level: %s, Output: %s", level, log_file)
+
+def _stop_log_listener():
+    """Flush queued log records and stop the listener thread at exit"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+# Default configuration structure, built once at import
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "azure_openai": {
+        "endpoint": "${AZURE_OPENAI_ENDPOINT}",
+        "api_key": "${AZURE_OPENAI_API_KEY}",
+        "deployment_name": "gpt-4.1",
+        "api_version": "2024-10-21"
+    },
+    "application": {
+        "name": "Legacy Java Application",
+        "type": "legacy_java",
+        "default_timeout": 30000,
+        "slow_mo": 1000
+    },
+    "browser_config": {
+        "type": "chromium",
+        "headless": True,
+        "viewport": {
+            "width": 1920,
+            "height": 1080
         },
-        "browser_config": {
-            "type": "chromium",
-            "headless": True,
-            "viewport": {
-                "width": 1920,
-                "height": 1080
-            },
-            "context_options": {
-                "ignore_https_errors": True,
-                "accept_downloads": False
-            },
-            "launch_options": {
-                "slow_mo": 1000,
-                "args": [
-                    "--disable-web-security",
-                    "--ignore-certificate-errors",
-                    "--allow-running-insecure-content"
-                ]
-            }
+        "context_options": {
+            "ignore_https_errors": True,
+            "accept_downloads": False
         },
-        "storage": {
-            "base_path": "./test_data",
-            "results_retention_days": 30,
-            "enable_compression": False
+        "launch_options": {
+            "slow_mo": 1000,
+            "args": [
+                "--disable-web-security",
+                "--ignore-certificate-errors",
+                "--allow-running-insecure-content"
+            ]
+        }
+    },
+    "storage": {
+        "base_path": "./test_data",
+        "results_retention_days": 30,
+        "enable_compression": False
+    },
+    "agents": {
+        "nl_processor": {
+            "temperature": 0.1
         },
-        "agents": {
-            "nl_processor": {
-                "temperature": 0.1
-            },
-            "test_strategy": {
-                "temperature": 0.1
-            },
-            "test_generation": {
-                "temperature": 0.1
-            },
-            "self_healing": {
-                "temperature": 0.2
-            }
+        "test_strategy": {
+            "temperature": 0.1
         },
-        "reporting": {
-            "enable_console": True,
-            "enable_html": True,
-            "enable_screenshots": True,
-            "screenshot_on_failure": True,
-            "detailed_logging": True
+        "test_generation": {
+            "temperature": 0.1
         },
-        "logging": {
-            "level": "INFO",
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            "file_output": "./logs/ai_e2e_agent.log"
+        "self_healing": {
+            "temperature": 0.2
         }
+    },
+    "reporting": {
+        "enable_console": True,
+        "enable_html": True,
+        "enable_screenshots": True,
+        "screenshot_on_failure": True,
+        "detailed_logging": True
+    },
+    "logging": {
+        "level": "INFO",
+        "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        "file_output": "./logs/ai_e2e_agent.log"
     }
+}
+
+def get_default_config() -> Dict[str, Any]:
+    """
+    Get default configuration structure
+    Useful for initialization and testing
+    """
+    
+    return copy.deepcopy(_DEFAULT_CONFIG)
+
+def get_default_config_readonly() -> Dict[str, Any]:
+    """
+    Get the shared default configuration without copying
+    Callers must not mutate the returned dictionary
+    """
+    
+    return _DEFAULT_CONFIG
 
 def save_config(config: Dict[str, Any], output_path: str):
     """
@@ -305,9 +380,9 @@ def save_config(config: Dict[str, Any], output_path: str):
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
     with open(output_file, 'w') as f:
-        yaml.dump(config, f, default_flow_style=False, indent=2)
+        yaml.dump(config, f, Dumper=_YamlDumper, default_flow_style=False, indent=2)
     
-    logger.info(f"Configuration saved to {output_path}")
+    logger.info("Configuration saved to %s", output_path)
 
 def create_env_template(output_path: str = "config/.env.template"):
     """
@@ -337,7 +412,7 @@ LOG_LEVEL=INFO
     with open(output_file, 'w') as f:
         f.write(template_content)
     
-    logger.info(f"Environment template created at {output_path}")
+    logger.info("Environment template created at %s", output_path)
 
 # Testing and validation functions
 def test_config_loading():
@@ -346,7 +421,7 @@ def test_config_loading():
     print("Testing configuration management...")
     
     # Test 1: Default configuration
-    default_config = get_default_config()
+    default_config = get_default_config_readonly()
     validation_result = validate_config(default_config)
     
     print(f"Default config validation: {'✅' if validation_result.valid else '❌'}")
@@ -4,9 +4,17 @@ Orchestration Layer - Coordinates NLProcessor and WorkflowIntelligenceAgent
 Handles the decision-making between simple tests and complex workflows
 """
 
+import json
+import copy
+import asyncio
 import logging
+import time
+import uuid
+import itertools
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, ClassVar
 from ..agents.nl_processor_simple import NLProcessor
 from ..agents.workflow_intelligence_agent import WorkflowIntelligenceAgent
 from ..models.test_models import UserIntent
@@ -18,12 +26,61 @@ from ..core.azure_client import AzureOpenAIClient
 
 logger = logging.getLogger(__name__)
 
+# Timestamp format used in execution IDs
+_EXECUTION_ID_TIME_FORMAT = "%Y%m%d_%H%M%S"
+
 class TestOrchestrator:
     """
     Central orchestrator that coordinates between NLP and workflow intelligence
     Decides whether to route through simple test generation or workflow templates
     """
     
+    # Static lookup tables shared by all instances
+    _TIMEOUT_CONFIG = MappingProxyType({
+        "page_load": 300000,      # 300s for page loads
+        "action_timeout": 180000, # 180s for individual actions
+        "element_wait": 180000,   # 180s for element visibility
+        "navigation": 300000,     # 300s for navigation
+        "form_submission": 180000 # 180s for form submissions
+    })
+    _WAIT_CONDITIONS = MappingProxyType({
+        "navigate": "networkidle",
+        "click": "visible",
+        "type": "visible",
+        "wait": "visible",
+        "verify": "visible",
+        "select": "visible"
+    })
+    # Step count above which test assembly moves to a worker thread
+    _OFFLOAD_STEP_THRESHOLD: ClassVar[int] = 200
+    
+    # Context key -> template field id used when pre-filling templates
+    _CONTEXT_MAPPINGS: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ("url", "target_url"),
+        ("username", "username"),
+        ("password", "password")
+    )
+    _FALLBACKS_BY_ACTION = MappingProxyType({
+        "click": (
+            "button",
+            "a",
+            "input[type='button']",
+            "input[type='submit']",
+            "[role='button']"
+        ),
+        "type": (
+            "input[type='text']",
+            "input:not([type])",
+            "textarea",
+            "[contenteditable='true']"
+        ),
+        "select": (
+            "select",
+            "div[role='combobox']",
+            "div[class*='dropdown']"
+        )
+    })
+    
     def __init__(self, azure_client: AzureOpenAIClient, config_path: Path, nl_processor: NLProcessor = None):
         self.azure_client = azure_client
         self.config_path = config_path
@@ -36,6 +93,10 @@ class TestOrchestrator:
             
         self.workflow_agent = WorkflowIntelligenceAgent(azure_client, config_path)
         
+        # Positive workflow detections keyed by user input and parsed intent
+        self._detection_cache: "OrderedDict[Tuple[str, str], WorkflowDetectionResult]" = OrderedDict()
+        self._detection_cache_max_entries = 256
+        
         logger.info("TestOrchestrator initialized")
 
     async def process_user_request(self, user_input: str, context: Dict[str, Any] = None) -> WorkflowExecutionResponse:
@@ -46,19 +107,22 @@ class TestOrchestrator:
         try:
             execution_id = self._generate_execution_id()
             
-            logger.info(f"Processing user request [{execution_id}]: {user_input}")
+            logger.info("Processing user request [%s]: %s", execution_id, user_input)
             
             # Step 1: Parse user intent with NLP
             user_intent = await self.nl_processor.parse_user_intent(user_input, context)
             
+            # Attribute view of the intent (no copy), shared by both handlers
+            intent_dict = vars(user_intent)
+            
             # Step 2: Check if this requires workflow intelligence
             if user_intent.intent_type == "workflow" or getattr(user_intent, 'requires_template', False):
-                return await self._handle_workflow_request(execution_id, user_input, user_intent, context)
+                return await self._handle_workflow_request(execution_id, user_input, intent_dict, context)
             else:
-                return await self._handle_simple_request(execution_id, user_intent, context)
+                return await self._handle_simple_request(execution_id, intent_dict, context)
                 
         except Exception as e:
-            logger.error(f"Error processing user request: {e}")
+            logger.error("Error processing user request: %s", e)
             return WorkflowExecutionResponse(
                 execution_id=execution_id,
                 status=WorkflowStatus.FAILED,
@@ -69,18 +133,18 @@ class TestOrchestrator:
                 next_action="retry"
             )
 
-    async def _handle_workflow_request(self, execution_id: str, user_input: str, user_intent: UserIntent, context: Dict[str, Any]) -> WorkflowExecutionResponse:
+    async def _handle_workflow_request(self, execution_id: str, user_input: str, intent_dict: Dict[str, Any], context: Dict[str, Any]) -> WorkflowExecutionResponse:
         """Handle complex workflow requests requiring template customization"""
         try:
-            logger.info(f"Handling workflow request [{execution_id}]")
+            logger.info("Handling workflow request [%s]", execution_id)
             
             # Step 1: Detect specific workflow
-            workflow_detection = await self.workflow_agent.detect_workflow(user_input, user_intent.__dict__)
+            workflow_detection = await self._detect_workflow_cached(user_input, intent_dict)
             
             if not workflow_detection.detected:
                 # Fallback to simple test generation
-                logger.info(f"No specific workflow detected, falling back to simple test")
-                return await self._handle_simple_request(execution_id, user_intent, context)
+                logger.info("No specific workflow detected, falling back to simple test")
+                return await self._handle_simple_request(execution_id, intent_dict, context)
             
             # Step 2: Generate template
             workflow_template = await self.workflow_agent.generate_template(
@@ -92,7 +156,7 @@ class TestOrchestrator:
             if context:
                 self._prefill_template_from_context(workflow_template, context)
             
-            logger.info(f"Generated workflow template [{execution_id}]: {workflow_detection.workflow_id}")
+            logger.info("Generated workflow template [%s]: %s", execution_id, workflow_detection.workflow_id)
             
             return WorkflowExecutionResponse(
                 execution_id=execution_id,
@@ -105,20 +169,40 @@ class TestOrchestrator:
             )
             
         except Exception as e:
-            logger.error(f"Error handling workflow request [{execution_id}]: {e}")
+            logger.error("Error handling workflow request [%s]: %s", execution_id, e)
             raise
 
-    async def _handle_simple_request(self, execution_id: str, user_intent: UserIntent, context: Dict[str, Any]) -> WorkflowExecutionResponse:
+    async def _detect_workflow_cached(self, user_input: str, intent_dict: Dict[str, Any]) -> WorkflowDetectionResult:
+        """Detect workflow, reusing earlier positive detections for identical requests"""
+        cache_key = (user_input, json.dumps(intent_dict, sort_keys=True, default=str))
+        
+        cached_detection = self._detection_cache.get(cache_key)
+        if cached_detection is not None:
+            self._detection_cache.move_to_end(cache_key)
+            logger.debug("Workflow detection cache hit: %s", cached_detection.workflow_id)
+            return copy.deepcopy(cached_detection)
+        
+        workflow_detection = await self.workflow_agent.detect_workflow(user_input, intent_dict)
+        
+        # Only cache confident results; misses and errors are retried on the next request
+        if workflow_detection.detected:
+            self._detection_cache[cache_key] = copy.deepcopy(workflow_detection)
+            if len(self._detection_cache) > self._detection_cache_max_entries:
+                self._detection_cache.popitem(last=False)
+        
+        return workflow_detection
+
+    async def _handle_simple_request(self, execution_id: str, intent_dict: Dict[str, Any], context: Dict[str, Any]) -> WorkflowExecutionResponse:
         """Handle simple test requests that don't require workflow templates"""
         try:
-            logger.info(f"Handling simple test request [{execution_id}]")
+            logger.info("Handling simple test request [%s]", execution_id)
             
             # For simple requests, we'll return a basic test structure
             # This will be processed by the existing test generation pipeline
             
             simple_test = {
                 "test_type": "simple",
-                "user_intent": user_intent.__dict__,
+                "user_intent": intent_dict,
                 "context": context,
                 "timeout_config": self._get_enhanced_timeout_config()
             }
@@ -134,7 +218,7 @@ class TestOrchestrator:
             )
             
         except Exception as e:
-            logger.error(f"Error handling simple request [{execution_id}]: {e}")
+            logger.error("Error handling simple request [%s]: %s", execution_id, e)
             raise
 
     async def process_template_submission(self, execution_id: str, workflow_id: str, user_values: Dict[str, Any], dependency_responses: Dict[str, Any]) -> WorkflowExecutionResponse:
@@ -143,7 +227,7 @@ class TestOrchestrator:
         Generates enhanced workflow with dependencies
         """
         try:
-            logger.info(f"Processing template submission [{execution_id}]: {workflow_id}")
+            logger.info("Processing template submission [%s]: %s", execution_id, workflow_id)
             
             # Step 1: Enhance workflow with user values and dependencies
             enhanced_workflow = await self.workflow_agent.enhance_template(
@@ -152,10 +236,13 @@ class TestOrchestrator:
                 dependency_responses
             )
             
-            # Step 2: Generate complete test structure
-            complete_test = await self._generate_complete_test(enhanced_workflow)
+            # Step 2: Generate complete test structure (off the event loop for large workflows)
+            if len(enhanced_workflow.complete_test_steps) > self._OFFLOAD_STEP_THRESHOLD:
+                complete_test = await asyncio.to_thread(self._generate_complete_test, enhanced_workflow)
+            else:
+                complete_test = self._generate_complete_test(enhanced_workflow)
             
-            logger.info(f"Generated complete workflow test [{execution_id}] with {len(enhanced_workflow.included_workflows)} workflows")
+            logger.info("Generated complete workflow test [%s] with %s workflows", execution_id, len(enhanced_workflow.included_workflows))
             
             return WorkflowExecutionResponse(
                 execution_id=execution_id,
@@ -168,7 +255,7 @@ class TestOrchestrator:
             )
             
         except Exception as e:
-            logger.error(f"Error processing template submission [{execution_id}]: {e}")
+            logger.error("Error processing template submission [%s]: %s", execution_id, e)
             return WorkflowExecutionResponse(
                 execution_id=execution_id,
                 status=WorkflowStatus.FAILED,
@@ -179,29 +266,11 @@ class TestOrchestrator:
                 next_action="retry"
             )
 
-    async def _generate_complete_test(self, enhanced_workflow: EnhancedWorkflow) -> Dict[str, Any]:
+    def _generate_complete_test(self, enhanced_workflow: EnhancedWorkflow) -> Dict[str, Any]:
         """Generate complete test structure from enhanced workflow"""
         
         # Convert workflow steps to test generation format
-        test_steps = []
-        
-        for step in enhanced_workflow.complete_test_steps:
-            test_step = {
-                "step_id": step["step_id"],
-                "action": step["action"],
-                "description": step["description"],
-                "target": step.get("verification", ""),
-                "primary_selector": step.get("selector", ""),
-                "fallback_selectors": self._generate_fallback_selectors(step),
-                "timeout": step.get("timeout", 180000),
-                "wait_condition": self._get_wait_condition(step["action"]),
-                "value": step.get("value"),
-                "verification": step.get("verification", ""),
-                "critical": step.get("critical", True),
-                "screenshot_after": step.get("critical", False),
-                "workflow_source": step.get("workflow_source", "unknown")
-            }
-            test_steps.append(test_step)
+        test_steps = [self._make_test_step(step) for step in enhanced_workflow.complete_test_steps]
         
         # Create complete test structure
         complete_test = {
@@ -234,88 +303,61 @@ class TestOrchestrator:
         
         return complete_test
 
+    def _make_test_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert one enhanced workflow step into test generation format"""
+        action = step["action"]
+        verification = step.get("verification", "")
+        
+        return {
+            "step_id": step["step_id"],
+            "action": action,
+            "description": step["description"],
+            "target": verification,
+            "primary_selector": step.get("selector", ""),
+            "fallback_selectors": self._generate_fallback_selectors(step),
+            "timeout": step.get("timeout", 180000),
+            "wait_condition": self._WAIT_CONDITIONS.get(action, "visible"),
+            "value": step.get("value"),
+            "verification": verification,
+            "critical": step.get("critical", True),
+            "screenshot_after": step.get("critical", False),
+            "workflow_source": step.get("workflow_source", "unknown")
+        }
+
     def _generate_fallback_selectors(self, step: Dict[str, Any]) -> list:
         """Generate fallback selectors for a step"""
         primary_selector = step.get("selector", "")
-        action = step["action"]
-        
-        fallback_selectors = []
-        
-        if action == "click":
-            fallback_selectors = [
-                "button", 
-                "a", 
-                "input[type='button']",
-                "input[type='submit']",
-                "[role='button']"
-            ]
-        elif action == "type":
-            fallback_selectors = [
-                "input[type='text']",
-                "input:not([type])",
-                "textarea",
-                "[contenteditable='true']"
-            ]
-        elif action == "select":
-            fallback_selectors = [
-                "select",
-                "div[role='combobox']",
-                "div[class*='dropdown']"
-            ]
+        base_selectors = self._FALLBACKS_BY_ACTION.get(step["action"], ())
         
         # Remove primary selector from fallbacks if it exists
         if primary_selector:
-            fallback_selectors = [fs for fs in fallback_selectors if fs != primary_selector]
-        
-        return fallback_selectors
+            return [fs for fs in base_selectors if fs != primary_selector]
+        return list(base_selectors)
 
     def _get_wait_condition(self, action: str) -> str:
         """Get appropriate wait condition for action"""
-        wait_conditions = {
-            "navigate": "networkidle",
-            "click": "visible",
-            "type": "visible",
-            "wait": "visible",
-            "verify": "visible",
-            "select": "visible"
-        }
-        return wait_conditions.get(action, "visible")
+        return self._WAIT_CONDITIONS.get(action, "visible")
 
     def _get_enhanced_timeout_config(self) -> Dict[str, int]:
         """Get enhanced timeout configuration for all operations"""
-        return {
-            "page_load": 300000,      # 300s for page loads
-            "action_timeout": 180000, # 180s for individual actions
-            "element_wait": 180000,   # 180s for element visibility
-            "navigation": 300000,     # 300s for navigation
-            "form_submission": 180000 # 180s for form submissions
-        }
+        # Plain dict copy: the result is embedded in serialized test payloads
+        return dict(self._TIMEOUT_CONFIG)
 
     def _prefill_template_from_context(self, template: WorkflowTemplate, context: Dict[str, Any]) -> None:
         """Pre-fill template fields from context"""
-        context_mappings = {
-            "url": "target_url",
-            "username": "username", 
-            "password": "password"
-        }
+        # Index fields once; the first field with a given id wins, as in a linear scan
+        fields_by_id = {}
+        for field in itertools.chain(template.fields, template.global_fields):
+            fields_by_id.setdefault(field["field_id"], field)
         
-        for context_key, field_id in context_mappings.items():
-            if context_key in context:
-                # Find and update field
-                for field in template.fields + template.global_fields:
-                    if field["field_id"] == field_id:
-                        field["default_value"] = context[context_key]
-                        logger.debug(f"Pre-filled {field_id} from context")
-                        break
+        for context_key, field_id in self._CONTEXT_MAPPINGS:
+            if context_key in context and field_id in fields_by_id:
+                fields_by_id[field_id]["default_value"] = context[context_key]
+                logger.debug("Pre-filled %s from context", field_id)
 
     def _generate_execution_id(self) -> str:
         """Generate unique execution ID"""
-        import uuid
-        import datetime
-        
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
-        return f"session_{timestamp}_{unique_id}"
+        return f"session_{time.strftime(_EXECUTION_ID_TIME_FORMAT)}_{uuid.uuid4().hex[:8]}"
 
     # Public methods for workflow management
     
@@ -330,6 +372,7 @@ class TestOrchestrator:
     def refresh_workflows(self) -> None:
         """Refresh workflow definitions"""
         self.workflow_agent.refresh_workflows()
+        self._detection_cache.clear()
         logger.info("Workflows refreshed")
 
     async def validate_template_values(self, workflow_id: str, user_values: Dict[str, Any]) -> Dict[str, Any]:
@@ -4,16 +4,216 @@ Data Storage Infrastructure
 Handles persistence of test results, configurations, and learning data
 """
 
+import os
+import re
+import mmap
 import json
+import time
 import logging
 import asyncio
+import threading
+import weakref
+from enum import Enum
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Iterator
 from dataclasses import asdict
 
+import aiofiles
+import aiofiles.os
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# Result filenames embed the execution id and store time
+_RESULT_FILENAME_PATTERN = re.compile(r"test_results_(.+)_(\d{8}_\d{6})\.json(?:\.zst)?")
+
+_STORAGE_SUBDIRECTORIES = (
+    "test_results",
+    "execution_logs",
+    "screenshots",
+    "agent_data",
+    "learning_data",
+    "configurations"
+)
+
+# Base paths whose directory structure was already created in this process
+_INITIALIZED_PATHS = set()
+
+# Live storages, so application shutdown can flush and close them all
+_OPEN_STORAGES = weakref.WeakSet()
+
+
+def _default(obj: Any) -> Any:
+    """Convert a value the JSON encoder can't handle; the encoder recurses into the result"""
+    if isinstance(obj, (datetime, Path)):
+        return str(obj)
+    if hasattr(obj, '__dataclass_fields__'):
+        return asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if hasattr(obj, '__dict__'):
+        return vars(obj)
+    return str(obj)
+
+
+def _scan_directory_usage(path: str) -> Tuple[int, int]:
+    """Total size and count of regular files below a directory"""
+    total_size = 0
+    file_count = 0
+    with os.scandir(path) as dir_entries:
+        for dir_entry in dir_entries:
+            if dir_entry.is_dir(follow_symlinks=False):
+                sub_size, sub_count = _scan_directory_usage(dir_entry.path)
+                total_size += sub_size
+                file_count += sub_count
+            elif dir_entry.is_file(follow_symlinks=False):
+                total_size += dir_entry.stat(follow_symlinks=False).st_size
+                file_count += 1
+    return total_size, file_count
+
+
+def _iter_json_lines_reversed(path: Path) -> Iterator[Any]:
+    """Decode the lines of a JSONL file from the end, reading only as far as the caller consumes"""
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return
+        
+        with mm:
+            end = len(mm)
+            while end > 0:
+                start = mm.rfind(b"\n", 0, end - 1) + 1
+                line = mm[start:end]
+                if line.strip():
+                    yield _json_loads(line)
+                end = start
+
+
+def _encode_json_line(data: Dict[str, Any]) -> bytes:
+    """Encode one compact JSON line for a shard"""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE
+        )
+    return (json.dumps(data, default=_default) + "\n").encode("utf-8")
+
+
+class _BatchedWriter:
+    """
+    Collects shard appends from concurrent stores and writes them in batches
+    Belongs to one event loop. A background task writes pending payloads as soon as it runs, so
+    appends submitted while a write is in flight share the next one; a positive flush_interval
+    instead holds each batch up to that long (or until max_batch_bytes are pending)
+    """
+    
+    def __init__(self, flush_interval: float = 0.0, max_batch_bytes: int = 64 * 1024):
+        self.flush_interval = flush_interval
+        self.max_batch_bytes = max_batch_bytes
+        # Day of the shards currently held open, maintained by DataStorage
+        self.shard_day: Optional[str] = None
+        self._pending: Dict[Path, List[Tuple[bytes, asyncio.Future]]] = {}
+        self._pending_bytes = 0
+        self._files: Dict[Path, Any] = {}
+        # Must be constructed inside the loop it serves
+        self._loop = asyncio.get_running_loop()
+        self._task: Optional[asyncio.Task] = None
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._lock = asyncio.Lock()
+    
+    async def submit(self, path: Path, payload: bytes) -> bool:
+        """Queue a payload and wait for its batch, returning True if that batch created the file"""
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._run())
+        
+        future = self._loop.create_future()
+        self._pending.setdefault(path, []).append((payload, future))
+        self._pending_bytes += len(payload)
+        self._has_pending.set()
+        if self._pending_bytes >= self.max_batch_bytes:
+            self._batch_full.set()
+        return await future
+    
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            if self.flush_interval > 0 and not self._batch_full.is_set():
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            await self.flush()
+    
+    async def flush(self) -> None:
+        """Write every pending payload, one write per file"""
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_bytes = 0
+            self._has_pending.clear()
+            self._batch_full.clear()
+            
+            for path, items in pending.items():
+                created = False
+                try:
+                    f = self._files.get(path)
+                    if f is None:
+                        created = not path.exists()
+                        f = await aiofiles.open(path, 'ab')
+                        self._files[path] = f
+                    await f.write(b"".join(payload for payload, _ in items))
+                    await f.flush()
+                except Exception as e:
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                
+                for position, (_, future) in enumerate(items):
+                    if not future.done():
+                        future.set_result(created and position == 0)
+    
+    async def close_files(self) -> None:
+        """Flush pending payloads and release open file handles"""
+        await self.flush()
+        async with self._lock:
+            files, self._files = self._files, {}
+            for f in files.values():
+                await f.close()
+    
+    async def aclose(self) -> None:
+        """Flush, close files and stop the background task"""
+        await self.close_files()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+async def aclose_all_storage() -> None:
+    """Flush and close every live DataStorage; called on application shutdown"""
+    for storage in list(_OPEN_STORAGES):
+        await storage.aclose()
+
+
 class DataStorage:
     """
     Data Storage Manager
@@ -24,27 +224,50 @@ class DataStorage:
         self.config = config
         self.base_path = Path(config.get("base_path", "./test_data"))
         self.retention_days = config.get("results_retention_days", 30)
+        # Indented output roughly doubles file size and encode time, keep it opt-in
+        self.pretty_json = config.get("pretty_json", False)
+        # fsync result files before they become visible; off by default like the previous direct writes
+        self.durable_writes = config.get("durable_writes", False)
+        # Repetitive result JSON compresses well; compressed files are stored as .json.zst
+        self.compress_results = config.get("compress_results", False)
+        if self.compress_results and zstandard is None:
+            logger.warning("compress_results is enabled but zstandard is not installed, storing plain JSON")
+            self.compress_results = False
+        # Append-only index of stored results (in append order) so queries don't glob + stat every file
+        self.results_index_path = self.base_path / "results_index.jsonl"
+        # Serializes index appends, reads and rewrites; they run in worker threads from any loop
+        self._index_lock = threading.RLock()
+        # Agent and learning entries go to one JSONL shard per name and day, written in batches
+        # by a writer per event loop (call_agent_sync runs its own loop beside the app's)
+        self.write_flush_interval = config.get("write_flush_interval", 0.0)
+        self.write_batch_bytes = config.get("write_batch_bytes", 64 * 1024)
+        self._writers: Dict[asyncio.AbstractEventLoop, _BatchedWriter] = {}
+        # Per-directory [size_bytes, file_count], kept current on store/cleanup and rescanned after the TTL
+        self.stats_refresh_seconds = config.get("stats_refresh_seconds", 300)
+        self._stats_cache: Optional[Dict[str, List[int]]] = None
+        self._stats_scanned_at = 0.0
+        self._stats_lock: Optional[asyncio.Lock] = None
+        # Caps open file handles across concurrent retrievals; created on first use inside the loop
+        self.max_concurrent_reads = config.get("max_concurrent_reads", 16)
+        self._read_semaphore: Optional[asyncio.Semaphore] = None
         
         # Create directory structure
         self._initialize_storage()
+        _OPEN_STORAGES.add(self)
     
     def _initialize_storage(self):
         """Initialize storage directory structure"""
         
-        directories = [
-            self.base_path,
-            self.base_path / "test_results",
-            self.base_path / "execution_logs",
-            self.base_path / "screenshots",
-            self.base_path / "agent_data",
-            self.base_path / "learning_data",
-            self.base_path / "configurations"
-        ]
+        base_key = os.path.abspath(self.base_path)
+        if base_key not in _INITIALIZED_PATHS:
+            os.makedirs(base_key, exist_ok=True)
+            for subdirectory in _STORAGE_SUBDIRECTORIES:
+                directory = os.path.join(base_key, subdirectory)
+                if not os.path.isdir(directory):
+                    os.makedirs(directory, exist_ok=True)
+            _INITIALIZED_PATHS.add(base_key)
         
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
-        
-        logger.info(f"Data storage initialized at: {self.base_path}")
+        logger.info("Data storage initialized at: %s", self.base_path)
     
     async def store_test_results(self, execution_result: Dict[str, Any]) -> str:
         """
@@ -59,24 +282,30 @@ class DataStorage:
         
         try:
             execution_id = execution_result.get("execution_id", "unknown")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.now()
+            timestamp = f"{now:%Y%m%d_%H%M%S}"
             
             # Create filename
-            filename = f"test_results_{execution_id}_{timestamp}.json"
+            extension = ".json.zst" if self.compress_results else ".json"
+            filename = f"test_results_{execution_id}_{timestamp}{extension}"
             filepath = self.base_path / "test_results" / filename
             
-            # Ensure all data is serializable
-            serializable_result = self._make_serializable(execution_result)
-            
             # Write to file
-            with open(filepath, 'w') as f:
-                json.dump(serializable_result, f, indent=2, default=str)
-            
-            logger.info(f"Test results stored: {filepath}")
+            size = await self._write_json(filepath, execution_result)
+            self._track_usage("test_results", size, 1)
+            await self._append_results_index({
+                "execution_id": execution_id,
+                "path": filename,
+                "mtime": time.time(),
+                "start_time": execution_result.get("start_time")
+            })
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Test results stored: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            logger.error(f"Failed to store test results: {e}")
+            logger.error("Failed to store test results: %s", e)
             raise
     
     async def store_agent_data(self, agent_name: str, agent_result: Dict[str, Any]) -> str:
@@ -92,28 +321,28 @@ class DataStorage:
         """
         
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Create filename
-            filename = f"{agent_name}_{timestamp}.json"
-            filepath = self.base_path / "agent_data" / filename
+            now = datetime.now()
+            timestamp = f"{now:%Y%m%d_%H%M%S}"
             
             # Store agent data
             agent_data = {
                 "agent_name": agent_name,
                 "timestamp": timestamp,
-                "result": self._make_serializable(agent_result),
-                "stored_at": datetime.now().isoformat()
+                "result": agent_result,
+                "stored_at": now.isoformat()
             }
             
-            with open(filepath, 'w') as f:
-                json.dump(agent_data, f, indent=2, default=str)
+            filepath = await self._get_shard_path("agent_data", agent_name, now)
+            payload = _encode_json_line(agent_data)
+            created = await self._get_writer().submit(filepath, payload)
+            self._track_usage("agent_data", len(payload), int(created))
             
-            logger.info(f"Agent data stored: {filepath}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Agent data stored: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            logger.error(f"Failed to store agent data: {e}")
+            logger.error("Failed to store agent data: %s", e)
             raise
     
     async def get_recent_results(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -129,27 +358,15 @@ class DataStorage:
         
         try:
             results_dir = self.base_path / "test_results"
-            result_files = sorted(
-                results_dir.glob("test_results_*.json"),
-                key=lambda x: x.stat().st_mtime,
-                reverse=True
-            )[:limit]
             
-            results = []
-            for file_path in result_files:
-                try:
-                    with open(file_path, 'r') as f:
-                        result = json.load(f)
-                        results.append(result)
-                except Exception as e:
-                    logger.warning(f"Failed to load result file {file_path}: {e}")
-                    continue
+            recent_paths = await asyncio.to_thread(self._recent_result_paths, limit)
+            results = await self._load_json_files([results_dir / path for path in recent_paths], "result")
             
-            logger.info(f"Retrieved {len(results)} recent test results")
+            logger.info("Retrieved %s recent test results", len(results))
             return results
             
         except Exception as e:
-            logger.error(f"Failed to retrieve recent results: {e}")
+            logger.error("Failed to retrieve recent results: %s", e)
             return []
     
     async def get_results_by_date_range(self, start_date: datetime, 
@@ -167,29 +384,26 @@ class DataStorage:
         
         try:
             results_dir = self.base_path / "test_results"
-            all_files = results_dir.glob("test_results_*.json")
             
-            results = []
-            for file_path in all_files:
-                file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                
-                if start_date <= file_mtime <= end_date:
-                    try:
-                        with open(file_path, 'r') as f:
-                            result = json.load(f)
-                            results.append(result)
-                    except Exception as e:
-                        logger.warning(f"Failed to load result file {file_path}: {e}")
-                        continue
+            # Concurrent stores can append slightly out of mtime order, so filter every entry
+            index_entries = await asyncio.to_thread(self._read_results_index)
+            start_timestamp = start_date.timestamp()
+            end_timestamp = end_date.timestamp()
+            range_paths = dict.fromkeys(
+                entry["path"] for entry in index_entries
+                if start_timestamp <= entry["mtime"] <= end_timestamp
+            )
+            
+            results = await self._load_json_files([results_dir / path for path in range_paths], "result")
             
             # Sort by execution time
             results.sort(key=lambda x: x.get("start_time", ""), reverse=True)
             
-            logger.info(f"Retrieved {len(results)} results for date range")
+            logger.info("Retrieved %s results for date range", len(results))
             return results
             
         except Exception as e:
-            logger.error(f"Failed to retrieve results by date range: {e}")
+            logger.error("Failed to retrieve results by date range: %s", e)
             return []
     
     async def store_learning_data(self, learning_type: str, data: Dict[str, Any]) -> str:
@@ -205,25 +419,27 @@ class DataStorage:
         """
         
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{learning_type}_{timestamp}.json"
-            filepath = self.base_path / "learning_data" / filename
+            now = datetime.now()
+            timestamp = f"{now:%Y%m%d_%H%M%S}"
             
             learning_entry = {
                 "learning_type": learning_type,
                 "timestamp": timestamp,
-                "data": self._make_serializable(data),
-                "stored_at": datetime.now().isoformat()
+                "data": data,
+                "stored_at": now.isoformat()
             }
             
-            with open(filepath, 'w') as f:
-                json.dump(learning_entry, f, indent=2, default=str)
+            filepath = await self._get_shard_path("learning_data", learning_type, now)
+            payload = _encode_json_line(learning_entry)
+            created = await self._get_writer().submit(filepath, payload)
+            self._track_usage("learning_data", len(payload), int(created))
             
-            logger.info(f"Learning data stored: {filepath}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Learning data stored: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            logger.error(f"Failed to store learning data: {e}")
+            logger.error("Failed to store learning data: %s", e)
             raise
     
     async def get_learning_data(self, learning_type: str, limit: int = 50) -> List[Dict[str, Any]]:
@@ -239,30 +455,17 @@ class DataStorage:
         """
         
         try:
-            learning_dir = self.base_path / "learning_data"
-            pattern = f"{learning_type}_*.json"
+            learning_data, learning_files = await asyncio.to_thread(
+                self._scan_learning_data, learning_type, limit
+            )
+            if learning_files:
+                learning_data.extend(await self._load_json_files(learning_files, "learning"))
             
-            learning_files = sorted(
-                learning_dir.glob(pattern),
-                key=lambda x: x.stat().st_mtime,
-                reverse=True
-            )[:limit]
-            
-            learning_data = []
-            for file_path in learning_files:
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        learning_data.append(data)
-                except Exception as e:
-                    logger.warning(f"Failed to load learning file {file_path}: {e}")
-                    continue
-            
-            logger.info(f"Retrieved {len(learning_data)} learning entries for type: {learning_type}")
+            logger.info("Retrieved %s learning entries for type: %s", len(learning_data), learning_type)
             return learning_data
             
         except Exception as e:
-            logger.error(f"Failed to retrieve learning data: {e}")
+            logger.error("Failed to retrieve learning data: %s", e)
             return []
     
     async def cleanup_old_data(self):
@@ -270,76 +473,310 @@ class DataStorage:
         
         try:
             cutoff_date = datetime.now() - timedelta(days=self.retention_days)
-            cutoff_timestamp = cutoff_date.timestamp()
             
-            # Directories to clean
-            directories_to_clean = [
-                self.base_path / "test_results",
-                self.base_path / "execution_logs",
-                self.base_path / "agent_data"
-            ]
+            # Release shard handles so an expired shard is not kept open after unlink
+            await self._for_each_writer(_BatchedWriter.close_files)
             
-            total_deleted = 0
+            # The walk and unlinks are blocking, keep them off the event loop
+            deleted = await asyncio.to_thread(self._cleanup_old_data_sync, cutoff_date.timestamp())
             
-            for directory in directories_to_clean:
-                if directory.exists():
-                    for file_path in directory.iterdir():
-                        if file_path.is_file() and file_path.stat().st_mtime < cutoff_timestamp:
-                            try:
-                                file_path.unlink()
-                                total_deleted += 1
-                            except Exception as e:
-                                logger.warning(f"Failed to delete old file {file_path}: {e}")
+            total_deleted = 0
+            for directory_name, (deleted_size, deleted_count) in deleted.items():
+                self._track_usage(directory_name, -deleted_size, -deleted_count)
+                total_deleted += deleted_count
             
-            logger.info(f"Cleanup completed. Deleted {total_deleted} old files.")
+            logger.info("Cleanup completed. Deleted %s old files.", total_deleted)
             
         except Exception as e:
-            logger.error(f"Data cleanup failed: {e}")
+            logger.error("Data cleanup failed: %s", e)
+    
+    def _cleanup_old_data_sync(self, cutoff_timestamp: float) -> Dict[str, List[int]]:
+        """Delete expired files, returning the [size, count] removed per directory"""
+        
+        # Directories to clean
+        directories_to_clean = [
+            self.base_path / "test_results",
+            self.base_path / "execution_logs",
+            self.base_path / "agent_data"
+        ]
+        
+        deleted = {}
+        for directory in directories_to_clean:
+            if not directory.exists():
+                continue
+            removed = deleted.setdefault(directory.name, [0, 0])
+            with os.scandir(directory) as dir_entries:
+                for dir_entry in dir_entries:
+                    # The entry type comes from the directory read; only regular files need a stat
+                    if not dir_entry.is_file(follow_symlinks=False):
+                        continue
+                    file_stat = dir_entry.stat(follow_symlinks=False)
+                    if file_stat.st_mtime < cutoff_timestamp:
+                        try:
+                            os.unlink(dir_entry.path)
+                            removed[0] += file_stat.st_size
+                            removed[1] += 1
+                        except Exception as e:
+                            logger.warning("Failed to delete old file %s: %s", dir_entry.path, e)
+        
+        # Drop index entries for the results that were just removed; the lock keeps
+        # appends from landing between the read and the replace
+        with self._index_lock:
+            self._rewrite_results_index(
+                [entry for entry in self._read_results_index() if entry["mtime"] >= cutoff_timestamp]
+            )
+        return deleted
     
     async def get_storage_statistics(self) -> Dict[str, Any]:
         """Get storage usage statistics"""
         
         try:
+            if self._stats_lock is None:
+                self._stats_lock = asyncio.Lock()
+            
+            async with self._stats_lock:
+                # Counters are maintained on write; a periodic full scan reconciles any drift
+                if (self._stats_cache is None
+                        or time.monotonic() - self._stats_scanned_at >= self.stats_refresh_seconds):
+                    self._stats_cache = await asyncio.to_thread(self._scan_storage_usage)
+                    self._stats_scanned_at = time.monotonic()
+            
             stats = {
                 "base_path": str(self.base_path),
                 "total_size_mb": 0,
                 "directories": {}
             }
             
-            for subdir in self.base_path.iterdir():
-                if subdir.is_dir():
-                    dir_size = 0
-                    file_count = 0
-                    
-                    for file_path in subdir.rglob("*"):
-                        if file_path.is_file():
-                            dir_size += file_path.stat().st_size
-                            file_count += 1
-                    
-                    stats["directories"][subdir.name] = {
-                        "size_mb": round(dir_size / (1024 * 1024), 2),
-                        "file_count": file_count
-                    }
-                    stats["total_size_mb"] += dir_size / (1024 * 1024)
+            for name, (dir_size, file_count) in self._stats_cache.items():
+                stats["directories"][name] = {
+                    "size_mb": round(dir_size / (1024 * 1024), 2),
+                    "file_count": file_count
+                }
+                stats["total_size_mb"] += dir_size / (1024 * 1024)
             
             stats["total_size_mb"] = round(stats["total_size_mb"], 2)
             
             return stats
             
         except Exception as e:
-            logger.error(f"Failed to get storage statistics: {e}")
+            logger.error("Failed to get storage statistics: %s", e)
             return {}
     
-    def _make_serializable(self, obj: Any) -> Any:
-        """Convert object to JSON-serializable format"""
-        
-        if isinstance(obj, dict):
-            return {k: self._make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_serializable(item) for item in obj]
-        elif hasattr(obj, '__dict__'):
-            return self._make_serializable(asdict(obj) if hasattr(obj, '__dataclass_fields__') else vars(obj))
-        elif isinstance(obj, (datetime, Path)):
-            return str(obj)
+    def _scan_storage_usage(self) -> Dict[str, List[int]]:
+        """Walk every storage subdirectory and total its file sizes and counts"""
+        usage = {}
+        with os.scandir(self.base_path) as dir_entries:
+            for dir_entry in dir_entries:
+                if dir_entry.is_dir(follow_symlinks=False):
+                    usage[dir_entry.name] = list(_scan_directory_usage(dir_entry.path))
+        return usage
+    
+    def _track_usage(self, directory: str, size_delta: int, count_delta: int) -> None:
+        """Apply a store or delete to the cached storage statistics"""
+        if self._stats_cache is None:
+            return
+        usage = self._stats_cache.setdefault(directory, [0, 0])
+        usage[0] += size_delta
+        usage[1] += count_delta
+    
+    async def aclose(self) -> None:
+        """Flush pending shard writes, close shard files and stop the background writers"""
+        await self._for_each_writer(_BatchedWriter.aclose)
+        self._writers.clear()
+    
+    def _get_writer(self) -> _BatchedWriter:
+        """Return the shard writer for the running event loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        writer = self._writers.get(loop)
+        if writer is None:
+            # Forget writers of loops that have since been closed
+            for closed_loop in [other for other in self._writers if other.is_closed()]:
+                del self._writers[closed_loop]
+            writer = _BatchedWriter(
+                flush_interval=self.write_flush_interval,
+                max_batch_bytes=self.write_batch_bytes
+            )
+            self._writers[loop] = writer
+        return writer
+    
+    async def _for_each_writer(self, method) -> None:
+        """Run a writer coroutine method for every loop's writer, each on its own loop"""
+        current_loop = asyncio.get_running_loop()
+        for loop, writer in list(self._writers.items()):
+            try:
+                if loop is current_loop:
+                    await method(writer)
+                elif loop.is_running():
+                    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(method(writer), loop))
+                else:
+                    # The loop is gone, and its writer's task and files with it
+                    self._writers.pop(loop, None)
+            except Exception as e:
+                logger.warning("Failed to %s shard writer: %s", method.__name__, e)
+    
+    async def _get_shard_path(self, directory: str, name: str, now: datetime) -> Path:
+        """Return today's shard for a name, closing the previous day's shards on rollover"""
+        day = f"{now:%Y%m%d}"
+        writer = self._get_writer()
+        if day != writer.shard_day:
+            await writer.close_files()
+            writer.shard_day = day
+        return self.base_path / directory / f"{name}_{day}.jsonl"
+    
+    async def _write_json(self, filepath: Path, data: Dict[str, Any]) -> int:
+        """Encode data once and write it with a single non-blocking write, returning its size"""
+        if orjson is not None:
+            # Datetimes pass through to _default so files match the stdlib encoding
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if self.pretty_json:
+                option |= orjson.OPT_INDENT_2
+            payload = orjson.dumps(data, default=_default, option=option)
         else:
-            return obj
\ No newline at end of file
+            payload = json.dumps(data, indent=2 if self.pretty_json else None, default=_default).encode("utf-8")
+        
+        if filepath.suffix == ".zst":
+            payload = zstandard.ZstdCompressor().compress(payload)
+        
+        # Write beside the target and rename into place so readers never see a partial file
+        tmp_path = filepath.with_suffix(filepath.suffix + ".tmp")
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                await f.write(payload)
+                if self.durable_writes:
+                    await f.flush()
+                    await asyncio.to_thread(os.fsync, f.fileno())
+            await aiofiles.os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return len(payload)
+    
+    async def _append_results_index(self, entry: Dict[str, Any]) -> None:
+        """Append one entry to the results index"""
+        line = json.dumps(entry, default=str) + "\n"
+        await asyncio.to_thread(self._append_results_index_sync, entry["path"], line)
+    
+    def _append_results_index_sync(self, path: str, line: str) -> None:
+        """Append an encoded index line under the index lock"""
+        with self._index_lock:
+            if not self.results_index_path.exists():
+                # Index results stored before the index existed, before adding the new one
+                self._rewrite_results_index(
+                    [existing for existing in self._scan_results_index() if existing["path"] != path]
+                )
+            with open(self.results_index_path, 'a') as f:
+                f.write(line)
+    
+    def _scan_learning_data(self, learning_type: str, limit: int) -> Tuple[List[Dict[str, Any]], List[Path]]:
+        """Newest shard entries of a learning type, plus the pre-sharding files still needed to reach `limit`"""
+        learning_dir = self.base_path / "learning_data"
+        
+        # Shard names end in the day, so name order is date order; newest entries come first
+        learning_data = []
+        for shard_path in sorted(learning_dir.glob(f"{learning_type}_*.jsonl"), reverse=True):
+            if len(learning_data) >= limit:
+                break
+            for entry in _iter_json_lines_reversed(shard_path):
+                if len(learning_data) >= limit:
+                    break
+                learning_data.append(entry)
+        
+        # Entries stored before sharding are individual JSON files
+        learning_files = []
+        if len(learning_data) < limit:
+            learning_files = sorted(
+                learning_dir.glob(f"{learning_type}_*.json"),
+                key=lambda x: x.stat().st_mtime,
+                reverse=True
+            )[:limit - len(learning_data)]
+        return learning_data, learning_files
+    
+    def _recent_result_paths(self, limit: int) -> List[str]:
+        """Result filenames of the last `limit` distinct index entries, newest first"""
+        with self._index_lock:
+            if not self.results_index_path.exists():
+                self._read_results_index()
+            
+            # Newest entries are at the end of the index, so only its tail is read
+            recent_paths = []
+            seen_paths = set()
+            for entry in _iter_json_lines_reversed(self.results_index_path):
+                if len(recent_paths) >= limit:
+                    break
+                if entry["path"] not in seen_paths:
+                    seen_paths.add(entry["path"])
+                    recent_paths.append(entry["path"])
+            return recent_paths
+    
+    def _read_results_index(self) -> List[Dict[str, Any]]:
+        """Load the results index, building it from the results directory if missing"""
+        with self._index_lock:
+            if not self.results_index_path.exists():
+                entries = self._scan_results_index()
+                self._rewrite_results_index(entries)
+                return entries
+            
+            entries = []
+            with open(self.results_index_path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        entries.append(_json_loads(line))
+            return entries
+    
+    def _scan_results_index(self) -> List[Dict[str, Any]]:
+        """Build index entries for existing result files, oldest first"""
+        entries = []
+        with os.scandir(self.base_path / "test_results") as dir_entries:
+            for dir_entry in dir_entries:
+                match = _RESULT_FILENAME_PATTERN.fullmatch(dir_entry.name)
+                if match is None:
+                    continue
+                
+                # The store time is in the filename, so no stat() is needed
+                stored_at = datetime.strptime(match.group(2), "%Y%m%d_%H%M%S")
+                entries.append({
+                    "execution_id": match.group(1),
+                    "path": dir_entry.name,
+                    "mtime": stored_at.timestamp(),
+                    "start_time": None
+                })
+        
+        entries.sort(key=lambda entry: entry["mtime"])
+        return entries
+    
+    def _rewrite_results_index(self, entries: List[Dict[str, Any]]) -> None:
+        """Atomically replace the results index with the given entries; callers hold the index lock"""
+        tmp_path = self.results_index_path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, 'w') as f:
+            f.writelines(json.dumps(entry, default=str) + "\n" for entry in entries)
+        os.replace(tmp_path, self.results_index_path)
+    
+    async def _read_json(self, filepath: Path) -> Any:
+        """Read and decode a stored JSON file"""
+        async with self._read_semaphore:
+            async with aiofiles.open(filepath, 'rb') as f:
+                content = await f.read()
+        if filepath.suffix == ".zst":
+            content = zstandard.ZstdDecompressor().decompress(content)
+        return _json_loads(content)
+    
+    async def _load_json_files(self, file_paths: List[Path], kind: str) -> List[Any]:
+        """Read several stored JSON files concurrently, keeping order and skipping failures"""
+        if self._read_semaphore is None:
+            self._read_semaphore = asyncio.Semaphore(self.max_concurrent_reads)
+        
+        loaded = await asyncio.gather(
+            *(self._read_json(file_path) for file_path in file_paths),
+            return_exceptions=True
+        )
+        
+        results = []
+        for file_path, data in zip(file_paths, loaded):
+            if isinstance(data, Exception):
+                logger.warning("Failed to load %s file %s: %s", kind, file_path, data)
+                continue
+            results.append(data)
+        return results
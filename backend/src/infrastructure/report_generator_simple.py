@@ -4,80 +4,412 @@ Simplified Report Generator
 Generates comprehensive test execution reports without Azure AI dependency
 """
 
+import copy
 import json
+import functools
+import hashlib
+import itertools
 import logging
+import os
+import re
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, List
-from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple, Iterator, Iterable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 logger = logging.getLogger(__name__)
 
+# With cache_reports on, reports are memoized per (test_results, execution_id); results larger than this are not cached
+_REPORT_CACHE_MAX_ENTRIES = 128
+_REPORT_CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+# Report sections that can be left out when the caller does not need them
+_DETAIL_SECTIONS = frozenset({"test_details", "artifacts", "performance_analysis", "failure_analysis"})
+
+# Console report borders
+_CONSOLE_TOP_BORDER = "╔" + "═" * 62 + "╗"
+_CONSOLE_DIVIDER = "╠" + "═" * 62 + "╣"
+_CONSOLE_BOTTOM_BORDER = "╚" + "═" * 62 + "╝"
+
+# Step count from which step-time statistics are reduced with numpy
+_NUMPY_STEP_TIMES_THRESHOLD = 64
+
+# Raw step statuses by outcome, and their normalized names
+_PASSED_STATUSES = frozenset({"completed", "passed", "success"})
+_FAILED_STATUSES = frozenset({"failed", "failure"})
+_SKIPPED_STATUSES = frozenset({"skipped", "skip"})
+_ERROR_STATUSES = frozenset({"error"})
+_STATUS_MAP = (
+    {status: "passed" for status in _PASSED_STATUSES}
+    | {status: "failed" for status in _FAILED_STATUSES}
+    | {status: "skipped" for status in _SKIPPED_STATUSES}
+    | {status: "error" for status in _ERROR_STATUSES}
+)
+# Raw step status -> _StepScan counter it increments
+_STATUS_BUCKETS = (
+    {status: "passed" for status in _PASSED_STATUSES}
+    | {status: "failed" for status in _FAILED_STATUSES}
+    | {status: "skipped" for status in _SKIPPED_STATUSES}
+    | {status: "errors" for status in _ERROR_STATUSES}
+)
+# Steps with these statuses are listed in the failure analysis
+_FAILURE_ANALYSIS_STATUSES = frozenset({"failed", "error"})
+
+# Keyword probes run against the lowercased text of the results
+_LEGACY_RE = re.compile(r"cisco|catalyst|dna|java|legacy")
+_CISCO_RE = re.compile(r"cisco|catalyst")
+_ENVIRONMENT_RULES = (
+    (re.compile(r"localhost|127\.0\.0\.1"), "Local Development"),
+    (re.compile(r"staging|test"), "Staging/Test"),
+    (re.compile(r"prod"), "Production"),
+)
+
+# Failure categorization rules in priority order: (keywords, category, pattern, root cause, fix)
+_FAILURE_RULES = (
+    (("timeout",), "timeout",
+     "Timeout-related failures detected",
+     "Application or network latency issues",
+     "Increase timeout values or optimize application performance"),
+    (("element not found", "selector"), "selector_issues",
+     "Element selector failures",
+     "UI changes or dynamic content loading issues",
+     "Update element selectors or add wait conditions"),
+    (("network", "connection"), "network",
+     "Network connectivity issues",
+     "Network infrastructure or service availability",
+     "Check network connectivity and service status"),
+    (("authentication", "login"), "authentication",
+     "Authentication failures",
+     "Invalid credentials or authentication service issues",
+     "Verify credentials and authentication configuration"),
+    (("azure", "openai"), "ai_service",
+     "AI service integration issues",
+     "Azure OpenAI service connectivity or configuration",
+     "Check Azure OpenAI credentials and service availability"),
+)
+
+def _encode_report(report: Dict[str, Any], indent: bool = False) -> bytes:
+    """Serialize a report to UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        # Datetimes pass through to default=str so output matches the stdlib encoding
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(report, default=str, option=option)
+    return json.dumps(report, indent=2 if indent else None, default=str).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp; steps often share start/end strings, so results are cached"""
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _build_failure_automaton():
+    """Compile every rule keyword into one automaton, so each error message is scanned once"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, rule in enumerate(_FAILURE_RULES):
+        for keyword in rule[0]:
+            automaton.add_word(keyword, priority)
+    automaton.make_automaton()
+    return automaton
+
+
+_FAILURE_AUTOMATON = _build_failure_automaton()
+
+
+def _match_failure_rule(error: str) -> Optional[tuple]:
+    """Return the highest-priority rule whose keywords appear in a lowercased error"""
+    if _FAILURE_AUTOMATON is not None:
+        priority = min((match for _, match in _FAILURE_AUTOMATON.iter(error)), default=None)
+        return None if priority is None else _FAILURE_RULES[priority]
+    
+    for rule in _FAILURE_RULES:
+        if any(keyword in error for keyword in rule[0]):
+            return rule
+    return None
+
+
+@dataclass
+class _StepScan:
+    """Aggregates collected from a single pass over step_results"""
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    errors: int = 0
+    critical_failures: int = 0
+    healing_attempts: int = 0
+    healing_successes: int = 0
+    step_times: array = field(default_factory=lambda: array('d'))  # packed doubles, not boxed floats
+    details: List[Dict[str, Any]] = field(default_factory=list)
+    screenshot_paths: Dict[str, None] = field(default_factory=dict)  # insertion-ordered set
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class _KeywordProbe:
+    """Keyword indicators found in one walk over the test results"""
+    legacy: bool = False
+    cisco: bool = False
+    environment_rank: Optional[int] = None  # index into _ENVIRONMENT_RULES
+
+
+def _iter_text_leaves(obj: Any) -> Iterator[str]:
+    """Yield the lowercased keys and leaf values of nested results"""
+    if isinstance(obj, str):
+        yield obj.lower()
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from _iter_text_leaves(key)
+            yield from _iter_text_leaves(value)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            yield from _iter_text_leaves(item)
+    else:
+        yield str(obj).lower()
+
+
+def _probe_keywords(test_results: Dict[str, Any]) -> _KeywordProbe:
+    """Run the legacy, Cisco and environment probes over the results text, stringified once"""
+    # Newline-separated so no keyword can match across two leaves
+    text = "\n".join(_iter_text_leaves(test_results))
+    
+    # Every Cisco keyword is also a legacy keyword, so a Cisco hit skips the legacy scan
+    cisco = _CISCO_RE.search(text) is not None
+    probe = _KeywordProbe(legacy=cisco or _LEGACY_RE.search(text) is not None, cisco=cisco)
+    for rank, (pattern, _) in enumerate(_ENVIRONMENT_RULES):
+        if pattern.search(text):
+            probe.environment_rank = rank
+            break
+    
+    return probe
+
+
 class ReportGenerator:
     """
     Simplified Report Generator - No Azure AI Required
     Generates comprehensive test execution reports using rule-based logic
     """
     
-    def __init__(self):
+    # Report templates for different scenarios, shared by all instances
+    REPORT_TEMPLATES = MappingProxyType({
+        "success_summary": "✅ Test execution completed successfully with {success_rate}% success rate",
+        "partial_success": "⚠️ Test execution completed with {success_rate}% success rate - some steps failed",
+        "failure_summary": "❌ Test execution failed with {success_rate}% success rate",
+        "error_summary": "💥 Test execution encountered critical errors and could not complete"
+    })
+    
+    # Report metadata never varies between reports
+    _REPORT_METADATA = MappingProxyType({
+        "framework": "Playwright",
+        "generator": "Simplified Report Generator v1.0",
+        "browser": "Chromium",
+        "platform": "Cross-platform",
+        "report_version": "1.0",
+        "generated_by": "AI Test Automation Platform"
+    })
+    
+    def __init__(self, cache_reports: bool = False):
         # No Azure client needed - purely rule-based generation
-        self.report_templates = self._load_report_templates()
-        
-    def _load_report_templates(self) -> Dict[str, str]:
-        """Load report templates for different scenarios"""
-        return {
-            "success_summary": "✅ Test execution completed successfully with {success_rate}% success rate",
-            "partial_success": "⚠️ Test execution completed with {success_rate}% success rate - some steps failed",
-            "failure_summary": "❌ Test execution failed with {success_rate}% success rate",
-            "error_summary": "💥 Test execution encountered critical errors and could not complete"
-        }
+        # Memoizing costs a hash of the inputs and a report copy per call, so it is only
+        # worth enabling for callers that regenerate reports for the same results
+        self.cache_reports = cache_reports
+        self._report_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
     
-    def generate_report(self, test_results: Dict[str, Any], execution_id: str) -> Dict[str, Any]:
+    def generate_report(self, test_results: Dict[str, Any], execution_id: str,
+                        sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Generate a comprehensive test report using rule-based analysis
         
         Args:
             test_results: Results from test execution
             execution_id: Unique execution identifier
+            sections: Detail sections to build (test_details, artifacts,
+                performance_analysis, failure_analysis); None builds all of them
             
         Returns:
             Comprehensive test report with insights and recommendations
         """
+        # One timestamp per report, shared with the error report if generation fails
+        generated_at = datetime.now().isoformat()
         try:
+            # Only complete reports are cached; a cached one also serves partial requests
+            wanted = _DETAIL_SECTIONS if sections is None else _DETAIL_SECTIONS.intersection(sections)
+            
+            cache_key = self._report_cache_key(test_results, execution_id) if self.cache_reports else None
+            if cache_key is not None:
+                cached_report = self._report_cache.get(cache_key)
+                if cached_report is not None:
+                    self._report_cache.move_to_end(cache_key)
+                    logger.debug(f"Report cache hit for execution: {execution_id}")
+                    # Copy only the requested sections and stamp the copy as generated now
+                    report = {
+                        key: copy.deepcopy(value) for key, value in cached_report.items()
+                        if key not in _DETAIL_SECTIONS or key in wanted
+                    }
+                    report["generated_at"] = generated_at
+                    return report
+            
             logger.info(f"📊 Generating simplified report for execution: {execution_id}")
             
+            # Walk step_results once; every section below reads from this scan
+            scan = self._scan_steps(test_results)
+            
             # Analyze test results
-            analysis = self._analyze_test_results(test_results)
+            analysis = self._analyze_test_results(test_results, scan)
+            
+            # Keyword indicators, shared by the environment and legacy detectors
+            probe = _probe_keywords(test_results)
             
             # Generate insights based on analysis
-            insights = self._generate_insights(analysis, test_results)
+            insights = self._generate_insights(analysis, test_results, scan, probe)
             
             # Generate recommendations
-            recommendations = self._generate_recommendations(analysis, test_results)
+            recommendations = self._generate_recommendations(analysis, test_results, probe)
             
             # Create comprehensive report
             report = {
                 "execution_id": execution_id,
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": generated_at,
                 "overall_status": analysis["overall_status"],
-                "summary": self._generate_summary(analysis, test_results),
+                "summary": self._generate_summary(analysis, test_results, probe),
                 "insights": insights,
-                "recommendations": recommendations,
-                "test_details": self._generate_test_details(test_results),
-                "artifacts": self._collect_artifacts(test_results),
-                "metadata": self._generate_metadata(),
-                "performance_analysis": self._analyze_performance(test_results),
-                "failure_analysis": self._analyze_failures(test_results) if analysis["has_failures"] else None
+                "recommendations": recommendations
             }
             
+            if "test_details" in wanted:
+                report["test_details"] = self._generate_test_details(test_results, scan)
+            if "artifacts" in wanted:
+                report["artifacts"] = self._collect_artifacts(test_results, scan)
+            report["metadata"] = self._generate_metadata()
+            if "performance_analysis" in wanted:
+                report["performance_analysis"] = self._analyze_performance(test_results, scan)
+            if "failure_analysis" in wanted:
+                report["failure_analysis"] = self._analyze_failures(test_results, scan) if analysis["has_failures"] else None
+            
+            if cache_key is not None and sections is None:
+                self._report_cache[cache_key] = report
+                if len(self._report_cache) > _REPORT_CACHE_MAX_ENTRIES:
+                    self._report_cache.popitem(last=False)
+                report = copy.deepcopy(report)
+            
             logger.info(f"✅ Simplified report generated successfully for {execution_id}")
             return report
             
         except Exception as e:
             logger.error(f"❌ Simplified report generation failed: {e}")
             # Return basic error report
-            return self._generate_error_report(execution_id, str(e))
+            return self._generate_error_report(execution_id, str(e), generated_at)
+    
+    def generate_report_bytes(self, test_results: Dict[str, Any], execution_id: str) -> bytes:
+        """Generate a report and return it as compact JSON bytes, ready for HTTP or disk"""
+        return _encode_report(self.generate_report(test_results, execution_id))
+    
+    def _report_cache_key(self, test_results: Dict[str, Any], execution_id: str) -> Optional[bytes]:
+        """Stable digest of the report inputs, or None when the results are too large to cache"""
+        try:
+            if orjson is not None:
+                serialized = orjson.dumps(
+                    test_results, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                )
+            else:
+                serialized = json.dumps(test_results, sort_keys=True, default=str).encode("utf-8")
+        except (TypeError, ValueError):
+            return None
+        
+        if len(serialized) > _REPORT_CACHE_MAX_BYTES:
+            return None
+        
+        digest = hashlib.blake2b(serialized, digest_size=16)
+        digest.update(str(execution_id).encode("utf-8"))
+        return digest.digest()
     
-    def _analyze_test_results(self, test_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _scan_steps(self, test_results: Dict[str, Any]) -> _StepScan:
+        """Collect status counts, durations, details, screenshots and failures in one pass over the steps"""
+        
+        scan = _StepScan()
+        counts = {"passed": 0, "failed": 0, "skipped": 0, "errors": 0}
+        
+        # Every step gets exactly one details entry, so size that list up front
+        steps = test_results.get("step_results") or []
+        scan.details = [None] * len(steps)
+        
+        for index, step in enumerate(steps):
+            status = step.get("status", "unknown").lower()
+            
+            # One table lookup picks the counter instead of a chain of membership tests
+            bucket = _STATUS_BUCKETS.get(status)
+            if bucket is not None:
+                counts[bucket] += 1
+            scan.critical_failures += bucket == "failed" and bool(step.get("critical", False))
+            
+            # Check for healing attempts
+            healing_applied = step.get("healing_applied", False)
+            if healing_applied:
+                scan.healing_attempts += 1
+                scan.healing_successes += bucket == "passed"
+            
+            # Timestamps are parsed once per step for both the details and the performance stats
+            duration = self._step_duration_seconds(step)
+            if duration is not None and duration > 0:
+                scan.step_times.append(duration)
+            
+            screenshot_path = step.get("screenshot_path")
+            if screenshot_path:
+                scan.screenshot_paths[screenshot_path] = None
+            
+            scan.details[index] = {
+                "test_name": step.get("description", f"Step {step.get('step_id', 'Unknown')}"),
+                "status": self._normalize_status(status),
+                "duration": f"{duration:.1f}s" if duration is not None else "N/A",
+                "action": step.get("action", "unknown"),
+                "target": step.get("target", ""),
+                "error_message": step.get("error") if status == "failed" else None,
+                "screenshot": screenshot_path,
+                "healing_applied": healing_applied,
+                "selector_used": step.get("selector_used")
+            }
+            
+            if status in _FAILURE_ANALYSIS_STATUSES:
+                scan.failures.append({
+                    "step": step.get("description", "Unknown"),
+                    "error": step.get("error", "Unknown error"),
+                    "action": step.get("action", "unknown")
+                })
+        
+        scan.passed = counts["passed"]
+        scan.failed = counts["failed"]
+        scan.skipped = counts["skipped"]
+        scan.errors = counts["errors"]
+        return scan
+    
+    def _analyze_test_results(self, test_results: Dict[str, Any], scan: _StepScan) -> Dict[str, Any]:
         """Analyze test results to determine overall status and key metrics"""
         
         analysis = {
@@ -110,28 +442,17 @@ class ReportGenerator:
                 })
             
             elif "step_results" in test_results:
-                # Analyze individual step results
-                step_results = test_results.get("step_results", [])
-                analysis["total_tests"] = len(step_results)
-                
-                for step in step_results:
-                    status = step.get("status", "unknown").lower()
-                    if status in ["completed", "passed", "success"]:
-                        analysis["passed"] += 1
-                    elif status in ["failed", "failure"]:
-                        analysis["failed"] += 1
-                        if step.get("critical", False):
-                            analysis["critical_failures"] += 1
-                    elif status in ["skipped", "skip"]:
-                        analysis["skipped"] += 1
-                    elif status in ["error"]:
-                        analysis["errors"] += 1
-                    
-                    # Check for healing attempts
-                    if step.get("healing_applied", False):
-                        analysis["healing_attempts"] += 1
-                        if status in ["completed", "passed", "success"]:
-                            analysis["healing_successes"] += 1
+                # Use the counts from the step scan
+                analysis.update({
+                    "total_tests": len(test_results["step_results"]),
+                    "passed": scan.passed,
+                    "failed": scan.failed,
+                    "skipped": scan.skipped,
+                    "errors": scan.errors,
+                    "critical_failures": scan.critical_failures,
+                    "healing_attempts": scan.healing_attempts,
+                    "healing_successes": scan.healing_successes
+                })
             
             elif "agent_results" in test_results:
                 # Analyze agent-based results
@@ -166,8 +487,8 @@ class ReportGenerator:
             end_time = test_results.get("end_time")
             if start_time and end_time:
                 try:
-                    start = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                    end = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+                    start = _parse_timestamp(start_time)
+                    end = _parse_timestamp(end_time)
                     duration = end - start
                     analysis["execution_time"] = f"{duration.total_seconds():.1f}s"
                 except:
@@ -178,7 +499,8 @@ class ReportGenerator:
         
         return analysis
     
-    def _generate_summary(self, analysis: Dict[str, Any], test_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_summary(self, analysis: Dict[str, Any], test_results: Dict[str, Any],
+                          probe: _KeywordProbe) -> Dict[str, Any]:
         """Generate executive summary"""
         
         status = analysis["overall_status"]
@@ -186,16 +508,16 @@ class ReportGenerator:
         
         # Select appropriate summary template
         if status == "SUCCESS":
-            summary_text = self.report_templates["success_summary"].format(success_rate=success_rate)
+            summary_text = self.REPORT_TEMPLATES["success_summary"].format(success_rate=success_rate)
             status_icon = "✅"
         elif status == "PARTIAL_SUCCESS":
-            summary_text = self.report_templates["partial_success"].format(success_rate=success_rate)
+            summary_text = self.REPORT_TEMPLATES["partial_success"].format(success_rate=success_rate)
             status_icon = "⚠️"
         elif status == "FAILURE":
-            summary_text = self.report_templates["failure_summary"].format(success_rate=success_rate)
+            summary_text = self.REPORT_TEMPLATES["failure_summary"].format(success_rate=success_rate)
             status_icon = "❌"
         else:
-            summary_text = self.report_templates["error_summary"]
+            summary_text = self.REPORT_TEMPLATES["error_summary"]
             status_icon = "💥"
         
         return {
@@ -207,10 +529,11 @@ class ReportGenerator:
             "failed": analysis["failed"],
             "skipped": analysis["skipped"],
             "execution_time": analysis["execution_time"],
-            "environment": self._detect_environment(test_results)
+            "environment": self._detect_environment(probe)
         }
     
-    def _generate_insights(self, analysis: Dict[str, Any], test_results: Dict[str, Any]) -> List[str]:
+    def _generate_insights(self, analysis: Dict[str, Any], test_results: Dict[str, Any],
+                           scan: _StepScan, probe: _KeywordProbe) -> List[str]:
         """Generate rule-based insights from test results"""
         
         insights = []
@@ -237,7 +560,7 @@ class ReportGenerator:
             insights.append(f"⚠️ {analysis['critical_failures']} critical failures detected - immediate attention required")
         
         # Pattern detection
-        patterns = self._detect_patterns(test_results)
+        patterns = self._detect_patterns(test_results, scan, probe)
         insights.extend(patterns)
         
         # Performance insights
@@ -246,7 +569,8 @@ class ReportGenerator:
         
         return insights
     
-    def _generate_recommendations(self, analysis: Dict[str, Any], test_results: Dict[str, Any]) -> List[str]:
+    def _generate_recommendations(self, analysis: Dict[str, Any], test_results: Dict[str, Any],
+                                  probe: _KeywordProbe) -> List[str]:
         """Generate actionable recommendations based on test results"""
         
         recommendations = []
@@ -268,7 +592,7 @@ class ReportGenerator:
             recommendations.append("🔧 Review self-healing strategies for improved automatic recovery")
         
         # Environment-specific recommendations
-        env_recs = self._generate_environment_recommendations(test_results)
+        env_recs = self._generate_environment_recommendations(probe)
         recommendations.extend(env_recs)
         
         # Generic best practices
@@ -280,83 +604,58 @@ class ReportGenerator:
         
         return recommendations
     
-    def _generate_test_details(self, test_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_test_details(self, test_results: Dict[str, Any], scan: _StepScan) -> List[Dict[str, Any]]:
         """Generate detailed test step information"""
         
         details = []
         
-        # Process step results if available
+        # Step details were built during the step scan
         if "step_results" in test_results:
-            for step in test_results["step_results"]:
-                detail = {
-                    "test_name": step.get("description", f"Step {step.get('step_id', 'Unknown')}"),
-                    "status": self._normalize_status(step.get("status", "unknown")),
-                    "duration": self._calculate_step_duration(step),
-                    "action": step.get("action", "unknown"),
-                    "target": step.get("target", ""),
-                    "error_message": step.get("error") if step.get("status", "").lower() == "failed" else None,
-                    "screenshot": step.get("screenshot_path"),
-                    "healing_applied": step.get("healing_applied", False),
-                    "selector_used": step.get("selector_used")
-                }
-                details.append(detail)
+            details = scan.details
         
         # Process agent results if available
         elif "agent_results" in test_results:
-            for agent_name, result in test_results["agent_results"].items():
-                detail = {
+            details = [
+                {
                     "test_name": agent_name.replace('_', ' ').title(),
                     "status": "passed" if result.get("success", False) else "failed",
                     "duration": "N/A",
                     "error_message": result.get("error") if not result.get("success", False) else None
                 }
-                details.append(detail)
+                for agent_name, result in test_results["agent_results"].items()
+            ]
         
         return details
     
-    def _collect_artifacts(self, test_results: Dict[str, Any]) -> Dict[str, List[str]]:
+    def _collect_artifacts(self, test_results: Dict[str, Any], scan: _StepScan) -> Dict[str, List[str]]:
         """Collect test artifacts and evidence"""
         
-        artifacts = {
-            "screenshots": [],
-            "logs": [],
-            "reports": [],
+        # Listed screenshots come first, then step screenshots gathered during the scan;
+        # repeated paths are kept once, other entries (e.g. capture records) pass through
+        screenshots = []
+        seen_paths = set()
+        for screenshot in itertools.chain(test_results.get("screenshots") or [], scan.screenshot_paths):
+            if isinstance(screenshot, str):
+                if screenshot in seen_paths:
+                    continue
+                seen_paths.add(screenshot)
+            screenshots.append(screenshot)
+        
+        # New lists leave test_results untouched
+        return {
+            "screenshots": screenshots,
+            "logs": (test_results.get("logs") or []) + ["execution.log"],
+            "reports": ["test_report.json"],
             "videos": []
         }
-        
-        # Collect screenshots
-        if "screenshots" in test_results:
-            artifacts["screenshots"] = test_results["screenshots"]
-        
-        # Collect step screenshots
-        if "step_results" in test_results:
-            for step in test_results["step_results"]:
-                if step.get("screenshot_path"):
-                    artifacts["screenshots"].append(step["screenshot_path"])
-        
-        # Collect logs
-        if "logs" in test_results:
-            artifacts["logs"] = test_results["logs"]
-        
-        # Add standard artifacts
-        artifacts["logs"].append("execution.log")
-        artifacts["reports"].append("test_report.json")
-        
-        return artifacts
     
     def _generate_metadata(self) -> Dict[str, Any]:
         """Generate report metadata"""
         
-        return {
-            "framework": "Playwright",
-            "generator": "Simplified Report Generator v1.0",
-            "browser": "Chromium",
-            "platform": "Cross-platform",
-            "report_version": "1.0",
-            "generated_by": "AI Test Automation Platform"
-        }
+        # Reports are serialized and deep-copied, so hand out a plain dict copy
+        return dict(self._REPORT_METADATA)
     
-    def _analyze_performance(self, test_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_performance(self, test_results: Dict[str, Any], scan: _StepScan) -> Dict[str, Any]:
         """Analyze performance metrics"""
         
         performance = {
@@ -369,18 +668,14 @@ class ReportGenerator:
         
         try:
             if "step_results" in test_results:
-                step_times = []
-                for step in test_results["step_results"]:
-                    duration = self._calculate_step_duration_seconds(step)
-                    if duration > 0:
-                        step_times.append(duration)
+                step_times = scan.step_times
                 
                 if step_times:
-                    avg_time = sum(step_times) / len(step_times)
+                    avg_time, fastest, slowest = self._step_time_stats(step_times)
                     performance.update({
                         "average_step_time": f"{avg_time:.1f}s",
-                        "fastest_step": f"{min(step_times):.1f}s",
-                        "slowest_step": f"{max(step_times):.1f}s"
+                        "fastest_step": f"{fastest:.1f}s",
+                        "slowest_step": f"{slowest:.1f}s"
                     })
                     
                     # Performance grading
@@ -398,8 +693,8 @@ class ReportGenerator:
             end_time = test_results.get("end_time")
             if start_time and end_time:
                 try:
-                    start = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                    end = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+                    start = _parse_timestamp(start_time)
+                    end = _parse_timestamp(end_time)
                     duration = end - start
                     performance["total_execution_time"] = f"{duration.total_seconds():.1f}s"
                 except:
@@ -410,105 +705,77 @@ class ReportGenerator:
         
         return performance
     
-    def _analyze_failures(self, test_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze failure patterns and root causes"""
-        
-        failure_analysis = {
-            "total_failures": 0,
-            "failure_categories": {},
-            "common_patterns": [],
-            "root_causes": [],
-            "suggested_fixes": []
-        }
+    def _step_time_stats(self, step_times: array) -> Tuple[float, float, float]:
+        """Return (average, fastest, slowest) of non-empty step durations"""
         
-        failures = []
+        if np is not None and len(step_times) >= _NUMPY_STEP_TIMES_THRESHOLD:
+            # Zero-copy view over the packed doubles
+            arr = np.frombuffer(step_times, dtype=np.float64)
+            return float(arr.mean()), float(arr.min()), float(arr.max())
         
-        # Collect failures from step results
-        if "step_results" in test_results:
-            for step in test_results["step_results"]:
-                if step.get("status", "").lower() in ["failed", "error"]:
-                    failures.append({
-                        "step": step.get("description", "Unknown"),
-                        "error": step.get("error", "Unknown error"),
-                        "action": step.get("action", "unknown")
-                    })
+        return sum(step_times) / len(step_times), min(step_times), max(step_times)
+    
+    def _analyze_failures(self, test_results: Dict[str, Any], scan: _StepScan) -> Optional[Dict[str, Any]]:
+        """Analyze failure patterns and root causes, or return None when there are no failure records"""
+        
+        # Step failures were collected during the step scan
+        failures = scan.failures
         
         # Collect failures from agent results
         if "agent_results" in test_results:
-            for agent_name, result in test_results["agent_results"].items():
-                if not result.get("success", False):
-                    failures.append({
-                        "step": agent_name,
-                        "error": result.get("error", "Unknown error"),
-                        "action": "agent_execution"
-                    })
+            failures = failures + [
+                {
+                    "step": agent_name,
+                    "error": result.get("error", "Unknown error"),
+                    "action": "agent_execution"
+                }
+                for agent_name, result in test_results["agent_results"].items()
+                if not result.get("success", False)
+            ]
         
-        failure_analysis["total_failures"] = len(failures)
+        if not failures:
+            return None
         
         # Categorize failures
-        categories = {}
-        patterns = []
-        root_causes = []
-        fixes = []
+        categories = Counter()
+        patterns = set()
+        root_causes = set()
+        fixes = set()
         
         for failure in failures:
-            error = failure["error"].lower()
-            
             # Categorize by error type
-            if "timeout" in error:
-                categories["timeout"] = categories.get("timeout", 0) + 1
-                patterns.append("Timeout-related failures detected")
-                root_causes.append("Application or network latency issues")
-                fixes.append("Increase timeout values or optimize application performance")
-            
-            elif "element not found" in error or "selector" in error:
-                categories["selector_issues"] = categories.get("selector_issues", 0) + 1
-                patterns.append("Element selector failures")
-                root_causes.append("UI changes or dynamic content loading issues")
-                fixes.append("Update element selectors or add wait conditions")
-            
-            elif "network" in error or "connection" in error:
-                categories["network"] = categories.get("network", 0) + 1
-                patterns.append("Network connectivity issues")
-                root_causes.append("Network infrastructure or service availability")
-                fixes.append("Check network connectivity and service status")
-            
-            elif "authentication" in error or "login" in error:
-                categories["authentication"] = categories.get("authentication", 0) + 1
-                patterns.append("Authentication failures")
-                root_causes.append("Invalid credentials or authentication service issues")
-                fixes.append("Verify credentials and authentication configuration")
-            
-            elif "azure" in error or "openai" in error:
-                categories["ai_service"] = categories.get("ai_service", 0) + 1
-                patterns.append("AI service integration issues")
-                root_causes.append("Azure OpenAI service connectivity or configuration")
-                fixes.append("Check Azure OpenAI credentials and service availability")
+            rule = _match_failure_rule(failure["error"].lower())
+            
+            if rule is not None:
+                _, category, pattern, root_cause, fix = rule
+                categories[category] += 1
+                patterns.add(pattern)
+                root_causes.add(root_cause)
+                fixes.add(fix)
             
             else:
-                categories["other"] = categories.get("other", 0) + 1
-        
-        failure_analysis.update({
-            "failure_categories": categories,
-            "common_patterns": list(set(patterns)),
-            "root_causes": list(set(root_causes)),
-            "suggested_fixes": list(set(fixes))
-        })
+                categories["other"] += 1
         
-        return failure_analysis
+        return {
+            "total_failures": len(failures),
+            "failure_categories": dict(categories),
+            "common_patterns": list(patterns),
+            "root_causes": list(root_causes),
+            "suggested_fixes": list(fixes)
+        }
     
-    def _detect_patterns(self, test_results: Dict[str, Any]) -> List[str]:
+    def _detect_patterns(self, test_results: Dict[str, Any], scan: _StepScan, probe: _KeywordProbe) -> List[str]:
         """Detect patterns in test execution"""
         
         patterns = []
         
         # Check for Cisco Catalyst Centre specific patterns
-        if "cisco" in str(test_results).lower() or "catalyst" in str(test_results).lower():
+        if probe.cisco:
             patterns.append("🏢 Cisco Catalyst Centre application detected - legacy app optimizations active")
         
         # Check for browser-specific patterns
         if "step_results" in test_results:
-            screenshot_count = sum(1 for step in test_results["step_results"] if step.get("screenshot_path"))
+            screenshot_count = len(scan.screenshot_paths)
             if screenshot_count > 0:
                 patterns.append(f"📸 {screenshot_count} screenshots captured for debugging")
         
@@ -525,8 +792,8 @@ class ReportGenerator:
         
         if start_time and end_time:
             try:
-                start = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                end = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+                start = _parse_timestamp(start_time)
+                end = _parse_timestamp(end_time)
                 duration = end - start
                 total_seconds = duration.total_seconds()
                 
@@ -540,7 +807,7 @@ class ReportGenerator:
         
         return insights
     
-    def _generate_environment_recommendations(self, test_results: Dict[str, Any]) -> List[str]:
+    def _generate_environment_recommendations(self, probe: _KeywordProbe) -> List[str]:
         """Generate environment-specific recommendations"""
         
         recommendations = []
@@ -549,91 +816,55 @@ class ReportGenerator:
         recommendations.append("🌐 Consider testing across multiple browsers for compatibility")
         
         # Legacy application recommendations
-        if self._is_legacy_application(test_results):
+        if self._is_legacy_application(probe):
             recommendations.append("🏗️ Legacy application detected - ensure adequate timeouts and stability checks")
             recommendations.append("📱 Consider modernizing application UI for better automation reliability")
         
         return recommendations
     
-    def _detect_environment(self, test_results: Dict[str, Any]) -> str:
-        """Detect test environment from results"""
-        
-        # Check for environment indicators
-        test_str = str(test_results).lower()
-        
-        if "localhost" in test_str or "127.0.0.1" in test_str:
-            return "Local Development"
-        elif "staging" in test_str or "test" in test_str:
-            return "Staging/Test"
-        elif "prod" in test_str or "production" in test_str:
-            return "Production"
-        else:
+    def _detect_environment(self, probe: _KeywordProbe) -> str:
+        """Detect test environment from the probed keyword indicators"""
+        
+        if probe.environment_rank is None:
             return "Unknown Environment"
-    
-    def _is_legacy_application(self, test_results: Dict[str, Any]) -> bool:
-        """Detect if testing a legacy application"""
         
-        test_str = str(test_results).lower()
-        legacy_indicators = ["cisco", "catalyst", "dna", "java", "legacy"]
+        return _ENVIRONMENT_RULES[probe.environment_rank][1]
+    
+    def _is_legacy_application(self, probe: _KeywordProbe) -> bool:
+        """Detect if testing a legacy application from the probed keyword indicators"""
         
-        return any(indicator in test_str for indicator in legacy_indicators)
+        return probe.legacy
     
     def _normalize_status(self, status: str) -> str:
         """Normalize status values"""
         
         status_lower = status.lower()
-        
-        if status_lower in ["completed", "passed", "success"]:
-            return "passed"
-        elif status_lower in ["failed", "failure"]:
-            return "failed"
-        elif status_lower in ["skipped", "skip"]:
-            return "skipped"
-        elif status_lower in ["error"]:
-            return "error"
-        else:
-            return status_lower
-    
-    def _calculate_step_duration(self, step: Dict[str, Any]) -> str:
-        """Calculate human-readable step duration"""
-        
-        try:
-            start_time = step.get("start_time")
-            end_time = step.get("end_time")
-            
-            if start_time and end_time:
-                start = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                end = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-                duration = end - start
-                return f"{duration.total_seconds():.1f}s"
-        except:
-            pass
-        
-        return "N/A"
+        return _STATUS_MAP.get(status_lower, status_lower)
     
-    def _calculate_step_duration_seconds(self, step: Dict[str, Any]) -> float:
-        """Calculate step duration in seconds"""
+    def _step_duration_seconds(self, step: Dict[str, Any]) -> Optional[float]:
+        """Calculate step duration in seconds, or None when the step has no usable timestamps"""
         
         try:
             start_time = step.get("start_time")
             end_time = step.get("end_time")
             
             if start_time and end_time:
-                start = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                end = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+                start = _parse_timestamp(start_time)
+                end = _parse_timestamp(end_time)
                 duration = end - start
                 return duration.total_seconds()
         except:
             pass
         
-        return 0.0
+        return None
     
-    def _generate_error_report(self, execution_id: str, error_message: str) -> Dict[str, Any]:
+    def _generate_error_report(self, execution_id: str, error_message: str,
+                               generated_at: Optional[str] = None) -> Dict[str, Any]:
         """Generate basic error report when report generation fails"""
         
         return {
             "execution_id": execution_id,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": generated_at or datetime.now().isoformat(),
             "overall_status": "ERROR",
             "summary": {
                 "status_icon": "💥",
@@ -665,38 +896,42 @@ class ReportGenerator:
         """Generate a console-friendly text report"""
         
         try:
-            report = self.generate_report(test_results, test_results.get("execution_id", "unknown"))
-            
-            console_report = f"""
-╔══════════════════════════════════════════════════════════════╗
-║                    TEST EXECUTION REPORT                     ║
-╠══════════════════════════════════════════════════════════════╣
-║ Execution ID: {report['execution_id']:<44} ║
-║ Status: {report['summary']['status_icon']} {report['overall_status']:<48} ║
-║ Success Rate: {report['summary']['success_rate']:<44} ║
-║ Total Tests: {report['summary']['total_tests']:<45} ║
-║ Passed: {report['summary']['passed']:<48} ║
-║ Failed: {report['summary']['failed']:<48} ║
-║ Execution Time: {report['summary']['execution_time']:<40} ║
-╠══════════════════════════════════════════════════════════════╣
-║                         INSIGHTS                             ║
-╠══════════════════════════════════════════════════════════════╣
-"""
-            
-            for insight in report['insights'][:3]:  # Show top 3 insights
-                console_report += f"║ {insight[:58]:<58} ║\n"
-            
-            console_report += """╠══════════════════════════════════════════════════════════════╣
-║                     RECOMMENDATIONS                         ║
-╠══════════════════════════════════════════════════════════════╣
-"""
-            
-            for rec in report['recommendations'][:3]:  # Show top 3 recommendations
-                console_report += f"║ {rec[:58]:<58} ║\n"
-            
-            console_report += "╚══════════════════════════════════════════════════════════════╝"
-            
-            return console_report
+            # The console view only shows the summary, insights and recommendations
+            report = self.generate_report(test_results, test_results.get("execution_id", "unknown"), sections=())
+            
+            summary = report['summary']
+            lines = [
+                "",
+                _CONSOLE_TOP_BORDER,
+                "║                    TEST EXECUTION REPORT                     ║",
+                _CONSOLE_DIVIDER,
+                f"║ Execution ID: {str(report['execution_id']).ljust(44)} ║",
+                f"║ Status: {summary['status_icon']} {report['overall_status'].ljust(48)} ║",
+                f"║ Success Rate: {summary['success_rate'].ljust(44)} ║",
+                f"║ Total Tests: {str(summary['total_tests']).ljust(45)} ║",
+                f"║ Passed: {str(summary['passed']).ljust(48)} ║",
+                f"║ Failed: {str(summary['failed']).ljust(48)} ║",
+                f"║ Execution Time: {summary['execution_time'].ljust(40)} ║",
+                _CONSOLE_DIVIDER,
+                "║                         INSIGHTS                             ║",
+                _CONSOLE_DIVIDER
+            ]
+            
+            # Show top 3 insights
+            lines.extend(f"║ {insight[:58].ljust(58)} ║" for insight in report['insights'][:3])
+            
+            lines.extend((
+                _CONSOLE_DIVIDER,
+                "║                     RECOMMENDATIONS                         ║",
+                _CONSOLE_DIVIDER
+            ))
+            
+            # Show top 3 recommendations
+            lines.extend(f"║ {rec[:58].ljust(58)} ║" for rec in report['recommendations'][:3])
+            
+            lines.append(_CONSOLE_BOTTOM_BORDER)
+            
+            return "\n".join(lines)
             
         except Exception as e:
             return f"Console report generation failed: {e}"
@@ -710,10 +945,14 @@ class ReportGenerator:
                 output_path = f"test_reports/report_{report['execution_id']}_{timestamp}.json"
             
             # Ensure directory exists
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            
+            # Encode up front (orjson when available) and hand the file a single write
+            payload = _encode_report(report, indent=True)
+            with open(output_path, 'wb') as f:
+                f.write(payload)
             
             logger.info(f"📄 Report saved to: {output_path}")
             return output_path
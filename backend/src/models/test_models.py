@@ -4,11 +4,15 @@ Data Models for AI E2E Testing Agent
 Defines all data structures used across the system
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 from enum import Enum
 
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 # Enums for controlled values
 class TestActionType(str, Enum):
     """Types of test actions that can be performed"""
@@ -48,6 +52,7 @@ class ComplexityLevel(str, Enum):
     COMPLEX = "complex"
 
 # Data Transfer Objects (DTOs)
+# Keeps its __dict__: the orchestrator shares vars(user_intent) instead of copying
 @dataclass
 class UserIntent:
     """Parsed user intent from Natural Language Processor"""
@@ -66,7 +71,7 @@ class UserIntent:
     requires_template: bool = False
     extracted_values: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ApplicationAnalysis:
     """Application analysis from Test Strategy Agent"""
     app_type: str
@@ -75,7 +80,7 @@ class ApplicationAnalysis:
     timing_requirements: str
     authentication_method: str = "form_based"
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TestApproach:
     """Test approach configuration"""
     primary_method: str
@@ -84,7 +89,7 @@ class TestApproach:
     authentication_handling: str
     retry_policy: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ExecutionPhase:
     """Individual phase in test execution plan"""
     phase: str
@@ -93,7 +98,7 @@ class ExecutionPhase:
     timeout: int = 30000
     retry_attempts: int = 3
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TestStrategy:
     """Complete test strategy from Test Strategy Agent"""
     strategy_name: str
@@ -102,7 +107,7 @@ class TestStrategy:
     execution_plan: List[ExecutionPhase]
     risk_assessment: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class BrowserConfig:
     """Browser configuration for test execution"""
     headless: bool = True
@@ -111,7 +116,7 @@ class BrowserConfig:
     viewport_width: int = 1920
     viewport_height: int = 1080
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TestStep:
     """Individual test step with all execution details"""
     step_id: int
@@ -129,7 +134,7 @@ class TestStep:
     retry_attempts: int = 3
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TestScript:
     """Complete test script from Test Generation Agent"""
     test_name: str
@@ -139,7 +144,7 @@ class TestScript:
     estimated_duration: int = 0
     requirements: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class StepExecutionResult:
     """Result of executing a single test step"""
     step_id: int
@@ -156,7 +161,7 @@ class StepExecutionResult:
     healing_applied: bool = False
     execution_metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TestExecutionSummary:
     """Summary statistics for test execution"""
     total_steps: int
@@ -168,7 +173,7 @@ class TestExecutionSummary:
     average_step_duration: float
     healing_success_rate: float = 0.0
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TestResults:
     """Complete test execution results"""
     test_name: str
@@ -182,7 +187,7 @@ class TestResults:
     performance_metrics: Dict[str, Any] = field(default_factory=dict)
     error: Optional[str] = None
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AgentResult:
     """Result from individual agent execution"""
     agent_name: str
@@ -192,7 +197,7 @@ class AgentResult:
     execution_time: str = field(default_factory=lambda: datetime.now().isoformat())
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TestExecutionResult:
     """Complete result from AI Controller execution"""
     execution_id: str
@@ -206,7 +211,7 @@ class TestExecutionResult:
     error: Optional[str] = None
 
 # Element Detection Models
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ElementSelector:
     """Element selector with confidence and metadata"""
     selector: str
@@ -215,7 +220,7 @@ class ElementSelector:
     source: str  # primary, ai_generated, fallback
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SelfHealingResult:
     """Result of self-healing attempt"""
     success: bool
@@ -227,7 +232,7 @@ class SelfHealingResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 # Configuration Models
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AgentConfiguration:
     """Configuration for individual agents"""
     temperature: float
@@ -235,7 +240,7 @@ class AgentConfiguration:
     retry_attempts: int = 3
     enable_learning: bool = True
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SystemConfiguration:
     """Overall system configuration"""
     azure_openai: Dict[str, Any]
@@ -275,9 +280,19 @@ def calculate_test_summary(step_results: List[StepExecutionResult]) -> TestExecu
             average_step_duration=0.0
         )
     
-    passed = sum(1 for step in step_results if step.status == TestStatus.COMPLETED)
-    failed = sum(1 for step in step_results if step.status == TestStatus.FAILED)
-    skipped = sum(1 for step in step_results if step.status == TestStatus.SKIPPED)
+    # Tally statuses and healing in a single pass over the steps; compare by value,
+    # since results loaded from JSON carry plain strings rather than TestStatus members
+    passed = failed = skipped = healing_attempts = 0
+    for step in step_results:
+        status = step.status
+        if status == TestStatus.COMPLETED:
+            passed += 1
+        elif status == TestStatus.FAILED:
+            failed += 1
+        elif status == TestStatus.SKIPPED:
+            skipped += 1
+        if step.healing_applied:
+            healing_attempts += 1
     
     success_rate = (passed / total_steps) * 100
     
@@ -285,7 +300,6 @@ def calculate_test_summary(step_results: List[StepExecutionResult]) -> TestExecu
     total_duration = total_steps * 5.0  # Estimated execution time per step
     average_step_duration = total_duration / total_steps if total_steps > 0 else 0.0
     
-    healing_attempts = sum(1 for step in step_results if step.healing_applied)
     healing_success_rate = (healing_attempts / total_steps) * 100 if total_steps > 0 else 0.0
     
     return TestExecutionSummary(
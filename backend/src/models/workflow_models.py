@@ -3,10 +3,15 @@
 Workflow-related data models and structures
 """
 
-from typing import Dict, List, Any, Optional
+import sys
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Mapping
 from dataclasses import dataclass
 from enum import Enum
 
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class WorkflowStatus(Enum):
     PENDING = "pending"
     TEMPLATE_REQUIRED = "template_required"
@@ -24,7 +29,7 @@ class FieldType(Enum):
     EMAIL = "email"
     IP = "ip"
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class WorkflowDetectionResult:
     """Result of workflow detection from user input"""
     detected: bool
@@ -35,7 +40,7 @@ class WorkflowDetectionResult:
     requires_template: bool
     error_message: Optional[str] = None
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class WorkflowTemplate:
     """Template structure for workflow customization"""
     workflow_id: str
@@ -48,7 +53,7 @@ class WorkflowTemplate:
     dependency_questions: List[Dict[str, Any]]
     global_fields: List[Dict[str, Any]]
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class WorkflowValidationResult:
     """Result of workflow template validation"""
     valid: bool
@@ -56,6 +61,7 @@ class WorkflowValidationResult:
     warnings: List[str]
     validated_values: Dict[str, Any]
 
+# Keeps its __dict__: generated tests embed enhanced_workflow.__dict__ directly
 @dataclass
 class EnhancedWorkflow:
     """Enhanced workflow with dependencies and user values"""
@@ -66,7 +72,7 @@ class EnhancedWorkflow:
     complete_test_steps: List[Dict[str, Any]]
     estimated_total_duration: int
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class WorkflowExecutionRequest:
     """Request structure for workflow execution"""
     workflow_id: str
@@ -75,7 +81,7 @@ class WorkflowExecutionRequest:
     test_type: str = "functional"
     timeout_config: Optional[Dict[str, int]] = None
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class WorkflowExecutionResponse:
     """Response structure for workflow execution"""
     execution_id: str
@@ -134,18 +140,21 @@ class WorkflowKeywords:
         "inventory file", "provision devices", "assign devices", "device assignment",
         "bulk import", "csv import", "device list", "inventory management"
     ]
+    
+    # Built once; callers only read the grouping
+    _ALL_KEYWORDS = MappingProxyType({
+        WorkflowCategory.FABRIC: FABRIC_KEYWORDS,
+        WorkflowCategory.DEVICE_GROUP: DEVICE_GROUP_KEYWORDS,
+        WorkflowCategory.NETWORK_HIERARCHY: HIERARCHY_KEYWORDS,
+        WorkflowCategory.DEVICE_PROVISIONING: PROVISIONING_KEYWORDS,
+        WorkflowCategory.INVENTORY: INVENTORY_KEYWORDS,
+        WorkflowCategory.VLAN: VLAN_KEYWORDS,
+    })
 
     @classmethod
-    def get_all_keywords(cls) -> Dict[str, List[str]]:
-        """Get all workflow keywords grouped by category"""
-        return {
-            WorkflowCategory.FABRIC: cls.FABRIC_KEYWORDS,
-            WorkflowCategory.DEVICE_GROUP: cls.DEVICE_GROUP_KEYWORDS,
-            WorkflowCategory.NETWORK_HIERARCHY: cls.HIERARCHY_KEYWORDS,
-            WorkflowCategory.DEVICE_PROVISIONING: cls.PROVISIONING_KEYWORDS,
-            WorkflowCategory.INVENTORY: cls.INVENTORY_KEYWORDS,
-            WorkflowCategory.VLAN: cls.VLAN_KEYWORDS,
-        }
+    def get_all_keywords(cls) -> Mapping[str, List[str]]:
+        """Get all workflow keywords grouped by category (read-only)"""
+        return cls._ALL_KEYWORDS
 
 class WorkflowActions:
     """Standard workflow action types"""
@@ -167,16 +176,19 @@ class TimeoutConfig:
     NAVIGATION_TIMEOUT = 300000 # 300 seconds
     FORM_SUBMISSION = 180000    # 180 seconds
     
+    # Built once; callers only read the configuration
+    _TIMEOUT_CONFIG = MappingProxyType({
+        "page_load": PAGE_LOAD_TIMEOUT,
+        "action_timeout": ACTION_TIMEOUT,
+        "element_wait": ELEMENT_WAIT,
+        "navigation": NAVIGATION_TIMEOUT,
+        "form_submission": FORM_SUBMISSION
+    })
+    
     @classmethod
-    def get_timeout_config(cls) -> Dict[str, int]:
-        """Get complete timeout configuration"""
-        return {
-            "page_load": cls.PAGE_LOAD_TIMEOUT,
-            "action_timeout": cls.ACTION_TIMEOUT,
-            "element_wait": cls.ELEMENT_WAIT,
-            "navigation": cls.NAVIGATION_TIMEOUT,
-            "form_submission": cls.FORM_SUBMISSION
-        }
+    def get_timeout_config(cls) -> Mapping[str, int]:
+        """Get complete timeout configuration (read-only)"""
+        return cls._TIMEOUT_CONFIG
 
 class ValidationRules:
     """Common validation rule patterns"""